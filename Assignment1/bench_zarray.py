@@ -0,0 +1,72 @@
+"""
+Benchmark of the z algorithm engine in zarray.py against the previous list based Zalg.
+Reports memory per character (peak traced allocation during the call) and throughput.
+
+usage: python bench_zarray.py [n]
+"""
+import sys
+import time
+import random
+import tracemalloc
+from zarray import Zalg, zBuffer
+
+def listZalg(string: str):
+    """
+    The previous list based implementation, kept here for comparison.
+    """
+    n = len(string)
+    zVal = [0] * n
+    l = 0
+    r = 0
+    for i in range(1, n):
+        if i > r:
+            l = i
+            r = i
+            while r < n and string[r] == string[r-l]:
+                r += 1
+            zVal[i] += r-l
+            r -= 1
+        else:
+            k = i - l
+            if zVal[k] < r - i + 1:
+                zVal[i] = zVal[k]
+            else:
+                l = i
+                while r < n and string[r] == string[r-l]:
+                    r += 1
+                zVal[i] += r-l
+                r -= 1
+    return zVal
+
+def measure(name: str, func, n: int):
+    """
+    Runs func once under tracemalloc for the peak allocation and once more for the time.
+    """
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    print("{0:<28} {1:>8.2f} bytes/char {2:>8.2f} MB/s".format(name, peak / n, n / elapsed / 1e6))
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    random.seed(0)
+    string = ''.join(random.choice('acgt') for _ in range(n))
+    buf = string.encode('latin-1')
+    periodic = 'ab' * (n // 2)
+    periodic_buf = periodic.encode('latin-1')
+    out = zBuffer(n)
+
+    print("n = {0}".format(n))
+    measure("list Zalg, random", lambda: listZalg(string), n)
+    measure("array Zalg, random", lambda: Zalg(buf), n)
+    measure("array Zalg, random, reused", lambda: Zalg(buf, out), n)
+    measure("list Zalg, periodic", lambda: listZalg(periodic), n)
+    measure("array Zalg, periodic", lambda: Zalg(periodic_buf), n)
+    measure("array Zalg, periodic, reused", lambda: Zalg(periodic_buf, out), n)
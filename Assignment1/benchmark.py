@@ -0,0 +1,276 @@
+"""
+Benchmark suite for the string matching in q1 and q2.
+
+Generates synthetic corpora (random letters, DNA, natural language like words and
+periodic worst cases) and times the z algorithm, concatPatString, the Boyer-Moore search,
+the wildcard search and the transposition matcher on each. Every run reports throughput
+in MB/s, the peak RSS the operation adds on top of its corpus and, for sizes up to
+COMPARE_LIMIT, the number of character comparisons. A run whose process dies (for
+example out of memory) is recorded with its exit code instead of a time.
+The results are written as JSON so runs on different commits can be compared.
+
+usage: python benchmark.py [sizes] [output.json]       sizes like 1K,1M,100M,1G
+       python benchmark.py compare old.json new.json   flags throughput regressions
+"""
+import os
+import sys
+import json
+import time
+import queue
+import random
+import resource
+import subprocess
+import multiprocessing
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "q2:"))
+sys.path.insert(0, os.path.join(HERE, "q1:"))
+
+import q1
+import q2
+from zarray import Zalg
+
+DEFAULT_SIZES = "1K,64K,1M"
+
+# largest corpus that character comparisons are counted on, counting goes through Python
+COMPARE_LIMIT = 1 << 20
+
+# throughput drop that compare reports as a regression
+REGRESSION = 0.10
+
+# seconds between checks that a measuring process is still alive
+POLL = 1.0
+
+UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+WORDS = ("the of and to in is was that for it with as his on be at by had are but from "
+         "not have this which were she they or an all her one been their has would there "
+         "search pattern string suffix array match shift table prefix value index").split()
+
+def parseSize(size: str):
+    """
+    Size such as 64K or 1G in bytes.
+    """
+    size = size.strip().upper()
+    if size[-1] in UNITS:
+        return int(size[:-1]) * UNITS[size[-1]]
+    return int(size)
+
+def tile(base: bytes, n: int):
+    """
+    Repeats a generated block up to n bytes, so large corpora are cheap to make.
+    The copies are joined in one allocation of n bytes, so making the corpus
+    does not raise the peak RSS above the corpus itself.
+    """
+    parts = [base] * (n // len(base))
+    parts.append(base[:n % len(base)])
+    return b"".join(parts)
+
+def makeCorpus(kind: str, n: int):
+    """
+    Synthetic text of n bytes. Blocks of at most 1 MB are generated and tiled.
+    """
+    rng = random.Random(n)
+    block = min(n, 1 << 20)
+
+    if kind == "random":
+        base = bytes(rng.getrandbits(8) % 26 + 97 for _ in range(block))
+    elif kind == "dna":
+        base = bytes(rng.choice(b"acgt") for _ in range(block))
+    elif kind == "natural":
+        words = []
+        length = 0
+        while length < block:
+            # a few words are far more common than the rest, as in natural text
+            word = WORDS[min(int(rng.expovariate(0.15)), len(WORDS) - 1)]
+            words.append(word)
+            length += len(word) + 1
+        base = " ".join(words).encode('latin-1')
+    else:   # periodic worst case, one long run of a
+        base = b"a" * block
+
+    return tile(base, n)
+
+def makePattern(kind: str, corpus: bytes):
+    """
+    Pattern of the corpus kind, taken from the middle of the corpus so it matches,
+    or the classic aa...ab worst case for the periodic corpus.
+    """
+    if kind == "periodic":
+        return "a" * 15 + "b"
+
+    m = min(16, len(corpus))
+    start = (len(corpus) - m) // 2
+    return corpus[start : start + m].decode('latin-1')
+
+class CountingText(bytes):
+    """
+    A copy of a text that counts how many times its characters are indexed,
+    the number of character comparisons of the matchers that index the text directly.
+    It is still a bytes object, so reads through the buffer, such as the character
+    counting of textfile.charPositions, work and are not counted.
+    """
+    def __new__(cls, text: bytes):
+        self = super().__new__(cls, text)
+        self.reads = 0
+        return self
+
+    def __getitem__(self, i):
+        self.reads += 1
+        return bytes.__getitem__(self, i)
+
+def operations(corpus: bytes, pat: str):
+    """
+    The benchmarked operations, each a function of the text so it can be given a CountingText.
+    Operations whose input is built by joining buffers (and so can not be counted) are marked.
+    """
+    wildcard = pat[:len(pat) // 2] + "." + pat[len(pat) // 2 + 1:]
+    return [
+        ("Zalg", lambda text: Zalg(text), True),
+        ("concatPatString", lambda text: q1.concatPatString(pat, text), False),
+        ("search", lambda text: q2.countMatches(text, pat), True),
+        ("wildcard", lambda text: sum(1 for _ in q2.iterWildcardSearch(text, wildcard)), True),
+        ("transposition", lambda text: q1.countTranspositionMatches(text, pat), False),
+    ]
+
+def runOne(kind: str, n: int, op_index: int, queue):
+    """
+    Child process for one measurement. The peak RSS is read once the corpus is made and
+    again after the operation, and the difference is what the operation itself added.
+    """
+    corpus = makeCorpus(kind, n)
+    pat = makePattern(kind, corpus)
+    name, func, countable = operations(corpus, pat)[op_index]
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    func(corpus)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+    comparisons = None
+    if countable and n <= COMPARE_LIMIT:
+        counting = CountingText(corpus)
+        func(counting)
+        comparisons = counting.reads
+
+    queue.put({
+        "operation": name,
+        "corpus": kind,
+        "size": n,
+        "pattern_length": len(pat),
+        "seconds": seconds,
+        "mb_per_s": n / seconds / 1e6 if seconds > 0 else None,
+        "peak_rss_kb": peak,
+        "baseline_rss_kb": baseline,
+        "comparisons": comparisons,
+    })
+
+def collect(process, results_queue, name: str, kind: str, n: int):
+    """
+    Waits for the result of a measuring process. If the process exits without one,
+    a result with its exit code and no time is returned instead of waiting forever.
+    """
+    while True:
+        try:
+            return results_queue.get(timeout=POLL)
+        except queue.Empty:
+            if process.is_alive():
+                continue
+
+        # the process has exited, its result may still have arrived just before
+        try:
+            return results_queue.get(timeout=POLL)
+        except queue.Empty:
+            return {
+                "operation": name,
+                "corpus": kind,
+                "size": n,
+                "seconds": None,
+                "mb_per_s": None,
+                "peak_rss_kb": None,
+                "comparisons": None,
+                "error": "exit code {0}".format(process.exitcode),
+            }
+
+def runSuite(sizes: list):
+    """
+    Every operation on every corpus kind and size, each in its own process.
+    """
+    results = []
+    context = multiprocessing.get_context("fork")
+    names = [op[0] for op in operations(b"ab", "a")]
+
+    for n in sizes:
+        for kind in ("random", "dna", "natural", "periodic"):
+            for op_index in range(len(names)):
+                results_queue = context.Queue()
+                process = context.Process(target=runOne, args=(kind, n, op_index, results_queue))
+                process.start()
+                result = collect(process, results_queue, names[op_index], kind, n)
+                process.join()
+
+                results.append(result)
+                print("{0:<16} {1:<9} {2:>11} {3:>10.2f} MB/s {4:>9} KB {5}".format(
+                    result["operation"], kind, n, result["mb_per_s"] or 0,
+                    result["peak_rss_kb"], result.get("error", result["comparisons"])))
+
+    return results
+
+def gitCommit():
+    """
+    Commit the benchmark ran on, or None outside a git checkout.
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=HERE, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def loadResults(file: str):
+    """
+    Reads a JSON file written by the suite.
+    """
+    f = open(file, 'r')
+    results = json.load(f)
+    f.close()
+
+    return results
+
+def compare(old_file: str, new_file: str):
+    """
+    Prints the throughput change of every measurement in both runs, marking drops over REGRESSION.
+    Returns the number of regressions.
+    """
+    old = loadResults(old_file)
+    new = loadResults(new_file)
+
+    key = lambda r: (r["operation"], r["corpus"], r["size"])
+    before = {key(r): r for r in old["results"]}
+
+    regressions = 0
+    for r in new["results"]:
+        o = before.get(key(r))
+        if o is None or not o["mb_per_s"] or not r["mb_per_s"]:
+            continue
+
+        change = r["mb_per_s"] / o["mb_per_s"] - 1
+        flag = ""
+        if change < -REGRESSION:
+            flag = "REGRESSION"
+            regressions += 1
+        print("{0:<16} {1:<9} {2:>11} {3:>+8.1%} {4}".format(r["operation"], r["corpus"], r["size"], change, flag))
+
+    return regressions
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        sys.exit(1 if compare(sys.argv[2], sys.argv[3]) else 0)
+
+    sizes = [parseSize(size) for size in (sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SIZES).split(",")]
+    output = sys.argv[2] if len(sys.argv) > 2 else "benchmark.json"
+
+    results = runSuite(sizes)
+
+    f = open(output, 'w')
+    json.dump({"commit": gitCommit(), "python": sys.version.split()[0], "results": results}, f, indent=1)
+    f.close()
@@ -0,0 +1,146 @@
+import os
+import sys
+from collections import deque
+
+# zarray.py and textfile.py are shared between q1 and q2 and live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from textfile import ENCODING, read_mmap, textBlocks
+from q1 import read_file, write_counted
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a set of keys. Each key is stored with a value
+    and the search reports the value of every key ending at each position of the text.
+    """
+    def __init__(self):
+        self.goto = [{}]    # trie edges of each state
+        self.fail = [0]     # longest proper suffix of the state that is also a state
+        self.out = [[]]     # values of the keys ending at the state
+
+    def add(self, key, value):
+        """
+        Inserts a key into the trie, the automaton must be built again afterwards.
+        """
+        state = 0
+        for c in key:
+            if c not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+                self.goto[state][c] = len(self.goto) - 1
+            state = self.goto[state][c]
+
+        self.out[state].append(value)
+
+    def build(self):
+        """
+        Computes the failure links in breadth first order and merges the outputs
+        of each state with the outputs of its failure state.
+
+        Time Complexity: O(k), where k is the total length of the keys.
+        """
+        queue = deque(self.goto[0].values())   # states of depth 1 fail to the root
+
+        while queue:
+            state = queue.popleft()
+            for c, nxt in self.goto[state].items():
+                queue.append(nxt)
+
+                # follow the failure links until a state can be extended by c
+                f = self.fail[state]
+                while f and c not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(c, 0)
+
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def search(self, string):
+        """
+        Yields (i, value) for every key occurance, where i is the index of the last character of the key.
+        The string can be a str or UTF-8 text such as the memoryview from read_mmap, which is read
+        one block at a time (see textfile.textBlocks) with the state carried from block to block.
+
+        Time Complexity: O(n + z), where n is the length of the string and z the number of occurances.
+        """
+        goto = self.goto
+        fail = self.fail
+        out = self.out
+        state = 0
+
+        for offset, block in textBlocks(string):
+            if not isinstance(block, str):  # an ASCII block, compared as characters like the keys
+                block = str(block, ENCODING)
+
+            for i in range(len(block)):
+                c = block[i]
+                while state and c not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(c, 0)
+
+                for value in out[state]:
+                    yield offset + i, value
+
+def transposedVariants(pat):
+    """
+    The pattern itself along with every distinct string made by swapping one pair
+    of adjacent characters in it. Each variant comes with the index of the swap, or None
+    for the pattern. Swapping two equal characters gives the pattern back, so those are skipped.
+    """
+    variants = [(pat, None)]
+    for z in range(len(pat) - 1):
+        if pat[z] != pat[z + 1]:
+            variants.append((pat[:z] + pat[z + 1] + pat[z] + pat[z + 2:], z))
+
+    return variants
+
+def compileTranspositions(patterns: list):
+    """
+    Builds a single automaton holding every pattern and its m - 1 transposed variants.
+
+    Time Complexity: O(sum of m^2) over the patterns, the size of the variants.
+    """
+    automaton = AhoCorasick()
+    for p in range(len(patterns)):
+        for variant, z in transposedVariants(patterns[p]):
+            automaton.add(variant, (p, z))
+
+    automaton.build()
+    return automaton
+
+def multiTranspositionMatches(string, patterns: list, automaton: AhoCorasick = None):
+    """
+    Finds the exact and transposition matches of every pattern in one pass of the string.
+    The output is a list with the matches of each pattern, in the same format and
+    order as q1.transpositionMatches.
+
+    Time Complexity: O(n + z) after compiling, where z is the number of matches.
+    """
+    if automaton is None:
+        automaton = compileTranspositions(patterns)
+
+    matches = [[] for _ in patterns]
+    for i, (p, z) in automaton.search(string):
+        start = i - len(patterns[p]) + 2   # 1 based start of the window
+
+        if z is None:
+            matches[p].append((start,))
+        else:
+            matches[p].append((start, start + z))
+
+    return matches
+
+if __name__ == "__main__":
+    # reading in file names, the pattern file holds one pattern per line,
+    # each read as q1 reads its pattern, line ending included
+    _, textFile, patFile = sys.argv
+
+    string = read_mmap(textFile)
+    patterns = [pat for pat in read_file(patFile) if pat]
+
+    allMatches = multiTranspositionMatches(string, patterns)
+
+    # writing output to output_q1.txt, the count and matches of each pattern in turn
+    file = open("output_q1.txt", "w")
+    for matches in allMatches:
+        write_counted(file, matches)
+    file.close()
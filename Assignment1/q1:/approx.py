@@ -0,0 +1,125 @@
+import os
+import sys
+
+# zarray.py and textfile.py are shared between q1 and q2 and live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from textfile import ENCODING, read_mmap, textBlocks
+from q1 import read_file, write_matches
+
+SUBSTITUTION = "s"
+INSERTION = "i"
+DELETION = "d"
+TRANSPOSITION = "t"
+
+def charMasks(pat):
+    """
+    Bitvector of each character of the pattern, where bit j is set when pat[j] is the character.
+    """
+    masks = {}
+    for j in range(len(pat)):
+        masks[pat[j]] = masks.get(pat[j], 0) | (1 << j)
+
+    return masks
+
+def approxMatches(string, pat, k: int, ops: str = "sidt"):
+    """
+    Bit-parallel (shift-and) approximate matching with up to k errors in one pass of the string,
+    using Python ints as bitvectors of any length. ops picks the allowed errors from
+    substitutions "s", insertions "i", deletions "d" and adjacent transpositions "t".
+
+    R[d] has bit j set when pat[0..j] matches a suffix of the text read so far with at most d errors,
+    and each level is updated from the previous level as in Wu and Manber. T[d] keeps the
+    prefixes that could finish a transposition on the next character.
+    Yields (i, d) for every position i (1 based) where an occurance of the pattern ends,
+    with d the smallest number of errors. Without insertions or deletions the
+    occurance starts at i - m + 1.
+    The string can be a str or UTF-8 text such as the memoryview from read_mmap, which is read
+    one block at a time (see textfile.textBlocks) with the bitvectors carried from block to block.
+
+    Time Complexity: O(n * k * m / w), with w the machine word size.
+    Space Complexity: O(k * m / w + sigma)
+    """
+    m = len(pat)
+    if m == 0:
+        return
+
+    sub = SUBSTITUTION in ops
+    ins = INSERTION in ops
+    dele = DELETION in ops
+    trans = TRANSPOSITION in ops
+
+    masks = charMasks(pat)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+
+    # with deletions the first d characters of the pattern can be skipped before the text starts
+    R = [((1 << d) - 1) & full if dele else 0 for d in range(k + 1)]
+    T = [0] * (k + 1)
+
+    for offset, block in textBlocks(string):
+        if not isinstance(block, str):  # an ASCII block, compared as characters like the pattern
+            block = str(block, ENCODING)
+
+        for i in range(len(block)):
+            B = masks.get(block[i], 0)
+
+            prev = R[0]     # R[d - 1] before reading the character
+            R[0] = ((prev << 1) | 1) & B
+            for d in range(1, k + 1):
+                old = R[d]
+                new = ((old << 1) | 1) & B
+                if sub:
+                    new |= (prev << 1) | 1
+                if ins:
+                    new |= prev
+                if dele:
+                    new |= (R[d - 1] << 1) | 1
+                if trans:
+                    new |= (T[d] & B) << 1
+                    T[d] = ((prev << 1) | 1) & (B >> 1)
+
+                R[d] = new & full
+                prev = old
+
+            for d in range(k + 1):
+                if R[d] & last:
+                    yield offset + i + 1, d
+                    break
+
+def transpositionApprox(string, pat, offset: int = 0):
+    """
+    The bit-parallel engine with one transposition, giving the same matches as q1.transpositionMatches.
+    The position of the swap is found by comparing the reported window with the pattern,
+    so a bytes-like string is decoded first.
+    """
+    matches = []
+    len_pat = len(pat)
+    if not isinstance(string, str):
+        string = str(string, ENCODING)
+
+    for end, d in approxMatches(string, pat, 1, TRANSPOSITION):
+        start = end - len_pat   # 0 based start of the window
+        if d == 0:
+            matches.append((start + 1 + offset,))
+        else:
+            z = 0
+            while string[start + z] == pat[z]:
+                z += 1
+            matches.append((start + 1 + offset, start + z + 1 + offset))
+
+    return matches
+
+if __name__ == "__main__":
+    # reading in file names, the number of errors and the allowed errors (default all)
+    textFile, patFile, k = sys.argv[1], sys.argv[2], int(sys.argv[3])
+    ops = sys.argv[4] if len(sys.argv) > 4 else "sidt"
+
+    string = read_mmap(textFile)
+    patFileContents = read_file(patFile)
+
+    matches = []
+    if string and patFileContents:
+        matches = approxMatches(string, patFileContents[0], k, ops)
+
+    # writing output to output_q1.txt as the occurances are found, the end position and number of errors of each
+    write_matches("output_q1.txt", matches)
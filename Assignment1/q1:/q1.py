@@ -1,132 +1,245 @@
+import os
 import sys
+from itertools import islice
 
-def Zalg(string: str):
+# zarray.py and textfile.py are shared with q2 and live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from textfile import ENCODING, read_mmap, textBlocks
+from zarray import Zalg, join, encode, zBuffer, prefixMatches, suffixMatches
+
+# width of the count line written ahead of a generator's matches, enough for any 64 bit count
+COUNT_WIDTH = 20
+
+def concatPatString(pat, string, out=None):
     """
-    Implementation of the z algorithm to compute z values 
-    to identify matches in a string with a given pattern.
-    The input contains the pattern and string seperated by a "$".
+    Join the pattern and string, seperated by a "$". 
+    The z values are then computed by the z algorithm over the encoded bytes,
+    into out when a large enough buffer is given.
 
     Time Complexity: O(m + n), where m is the length of the pattern and n the length of the string.
-    Space Complexity: O(n), n is the length of the string after the "$".
+    Space Complexity: O(n), n is the length of the string.
     """
 
-    n = len(string)
-    zVal = [0] * n
+    txt = join(pat, "$", string)
 
-    # initialise left and right (z box) and k
-    l = 0
-    r = 0
-    k = 0
+    zVals = Zalg(txt, out)
+    return zVals
+    
+def iterTranspositionMatches(string, pat, offset: int = 0, block_size: int = 1 << 16):
+    """
+    Finds every window of the string that is either an exact match of the pattern or
+    matches it after swapping one pair of adjacent characters. The forward z values give
+    the matched prefix of each window and the backward z values give the matched suffix,
+    so a transposition at position z is confirmed when the suffix covers everything
+    after the swapped pair. The backward values are computed by reading the string right
+    to left, so no reversed copy of the string is made.
+    The z values are computed for block_size windows at a time into reused buffers, so a
+    caller that stops early (see countTranspositionMatches and hasTranspositionMatch)
+    only pays for the blocks it reached.
+    Each match is yielded as soon as it is found as a tuple, (i,) for an exact match
+    and (i, j) for a transposition at j, where i and j are 1 based positions shifted by offset.
+    A bytes-like string is UTF-8 text, such as the memoryview from read_mmap, and is matched
+    one block at a time (see textfile.textBlocks). ASCII blocks are compared as bytes in place
+    and only blocks with wider characters are decoded, so positions are character positions.
+
+    Time Complexity: O(n + (n / b) * m), where m is the length of the pattern, n the length of the string and b the block size.
+    Space Complexity: O(m + b)
+    """
+    len_pat = len(pat)
+    if len_pat == 0:
+        return
 
-    # iterate through the string
-    for i in range(1, n):
-        if i > r: # case 1, nothing has been matched yet
-            # making z box the current character at i
-            l = i 
-            r = i
+    # consecutive blocks share len_pat - 1 characters, so every window lies inside one of them
+    for start, block in textBlocks(string, len_pat - 1):
+        yield from blockTranspositionMatches(block, pat, offset + start, block_size)
 
-            # expanding the z box by increasing r for each matched character
-            while r < n and string[r] == string[r-l]:
-                r += 1
-            
-            zVal[i] += r-l  # set the z val as the size of the z box
-            r -= 1  
-        
-        else: # inside the z box
-            k = i - l   # index to corresponding z value
+def blockTranspositionMatches(string, pat, offset: int, block_size: int):
+    """
+    iterTranspositionMatches over one block of characters, a str or a bytes-like buffer
+    with one byte per character.
+    """
+    len_string = len(string)
+    len_pat = len(pat)
+
+    if len_pat == 0 or len_string < len_pat:
+        return
+
+    # a bytes-like string is compared against the encoded pattern and sliced without copying
+    if not isinstance(string, str):
+        pat = encode(pat)
+        if not isinstance(string, memoryview):
+            string = memoryview(string)
+
+    windows = len_string - len_pat + 1
+    block_size = max(1, min(block_size, windows))
+    zForw = zBuffer(block_size + len_pat - 1)
+    zBack = zBuffer(block_size + len_pat - 1)
+
+    for a in range(0, windows, block_size):
+        b = min(a + block_size, windows)
+        block = string[a : b + len_pat - 1]    # every window starting in [a, b)
+
+        # zForw[s - a] is the prefix of pat matched at string[s], zBack[e - a] the suffix of pat matched ending at string[e]
+        prefixMatches(pat, block, zForw)
+        suffixMatches(pat, block, zBack)
+
+        # goes from the start of the block to the last window starting in it
+        for s in range(b - a):
+            z = zForw[s]
+            if z == len_pat:
+                yield (s + a + 1 + offset,)
+
+            # number of characters after the transposition error that match sum to the length of the pattern.
+            # when z is 0 the start of the pattern didnt match and the first two chars are checked for a swap
+            elif zBack[s + len_pat - 1] == len_pat - z - 2:
+                tranpos_err = s + z
+                # checking if the transposition error characters match when switched
+                if block[tranpos_err + 1] == pat[z] and block[tranpos_err] == pat[z + 1]:
+                    yield (s + a + 1 + offset, tranpos_err + a + 1 + offset)
+
+def transpositionMatches(string, pat, offset: int = 0, limit: int = None):
+    """
+    List of the matches from iterTranspositionMatches, stopping after the first limit matches when given.
+    """
+    return list(islice(iterTranspositionMatches(string, pat, offset), limit))
 
-            if zVal[k] < r - i + 1: # case 2a, not reached end of z box, copy already computed z values across.
-                zVal[i] = zVal[k]
+def countTranspositionMatches(string, pat):
+    """
+    Number of matches, without keeping the matches or formatting them.
+    """
+    count = 0
+    for _ in iterTranspositionMatches(string, pat):
+        count += 1
 
-            else: # case 2b, the number of matches of this z box exceeds what is computed at the start
-                # start from r and check the next chars
-                l = i
+    return count
 
-                while r < n and string[r] == string[r-l]: # compare chars
-                    r += 1  # extend z box
-                
-                zVal[i] += r-l  # record the length of z box
-                r -= 1    
+def hasTranspositionMatch(string, pat):
+    """
+    Whether there is at least one match, the scan stops at the block of the first one.
+    """
+    for _ in iterTranspositionMatches(string, pat):
+        return True
 
-    return zVal
+    return False
 
-def concatPatString(pat, string):
+def streamTranspositionMatches(file: str, pat, chunk_size: int = 1 << 20):
     """
-    Join the pattern and string, seperated by a "$". 
-    The z values are then computed by the z algorithm
+    Streaming version of transpositionMatches for texts too large to hold in memory.
+    The file is read chunk_size characters at a time and the last len(pat) - 1 characters
+    of each chunk are carried into the next one, so every window that crosses a chunk
+    boundary is checked exactly once. The matches are yielded in the same order and
+    format as transpositionMatches over the whole file.
+
+    Time Complexity: O(n + (n / c) * m), where c is the chunk size.
+    Space Complexity: O(c + m)
+    """
+    len_pat = len(pat)
+    carry = ''
+    offset = 0  # number of characters before the start of the current buffer
+
+    # read as read_mmap reads the text, with line endings left as they are so positions agree
+    # the file is closed in finally, so a caller that stops early and closes the generator does not leak it
+    f = open(file, 'r', encoding=ENCODING, newline='')
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+
+            buf = carry + chunk
+            for match in iterTranspositionMatches(buf, pat, offset):
+                yield match
+
+            # keep the windows that have not been completed yet
+            keep = min(len(buf), max(len_pat - 1, 0))
+            carry = buf[len(buf) - keep:]
+            offset += len(buf) - keep
+    finally:
+        f.close()
+
+def write_matches(file: str, matches, batch_size: int = 1 << 16):
+    """
+    Writes the number of matches followed by one match per line, batch_size lines at a time.
+    matches can be a list or any iterable such as a match generator, see write_counted.
+    """
+    f = open(file, "w")
+    write_counted(f, matches, batch_size)
+    f.close()
 
-    Time Complexity: O(m + n), where m is the length of the pattern and n the length of the string.
-    Space Complexity: O(n), n is the length of the string.
+def write_counted(f, matches, batch_size: int = 1 << 16):
     """
+    Writes the number of matches and then the matches to an open file, so the counts and
+    matches of several patterns can follow one another. The count of a generator is only
+    known at the end, so a blank count line COUNT_WIDTH characters wide is written first,
+    the lines are streamed straight after it and the count is written over it at the end,
+    left aligned and padded with spaces. Memory stays constant however many matches there
+    are and each line is written once.
+    """
+    if isinstance(matches, list):
+        f.write("{0}\n".format(len(matches)))
+        write_lines(f, matches, batch_size)
+        return
 
-    txt = pat + "$" + string
+    start = f.tell()
+    f.write(" " * COUNT_WIDTH + "\n")
+    count = write_lines(f, matches, batch_size)
+
+    end = f.tell()
+    f.seek(start)
+    f.write("{0:<{1}}".format(count, COUNT_WIDTH))
+    f.seek(end)
+
+def write_lines(f, matches, batch_size: int):
+    """
+    Writes the matches to an open file, joining batch_size lines into one write.
+    Returns the number of matches written.
+    """
+    count = 0
+    batch = []
+    for match in matches:
+        batch.append(" ".join(map(str, match)))
+        if len(batch) == batch_size:
+            f.write("\n".join(batch) + "\n")
+            count += batch_size
+            batch = []
+
+    if batch:
+        f.write("\n".join(batch) + "\n")
+        count += len(batch)
+
+    return count
 
-    zVals = Zalg(txt)
-    return zVals
-    
 def read_file(file: str):
     """
     reading lines within a file.
     """
-    f = open(file, 'r')
+    f = open(file, 'r', encoding=ENCODING)
     lines = f.readlines()
     f.close()
 
     return lines
 
 if __name__ == "__main__":
-    # reading in file names
-    _, textFile, patFile = sys.argv
+    # reading in file names, an optional chunk size switches to streaming the text
+    textFile, patFile = sys.argv[1], sys.argv[2]
+    chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else 0
 
     # obtaining content from the files into a list
-    textFileContents = read_file(textFile)
     patFileContents = read_file(patFile)
 
-    numMatches = 0
     matches = []
 
-    # both text and pattern files need to have content
-    if textFileContents and patFileContents:
-        string = textFileContents[0]
-        pat = patFileContents[0]
-
-        # z values of the pattern and string as normal and reversed
-        zForw = concatPatString(pat, string)
-        zBack = concatPatString(pat[::-1], string[::-1])
-
-        len_string = len(string)
-        len_pat = len(pat)
-        len_z_arr = len(zForw) - 1
-
-        # goes from the start of the string (skipping pat$...) to the possible last occurance of the pattern in the text.
-        for i in range(len_pat + 1, len_z_arr - len_pat + 2):
-            if zForw[i] == len_pat:
-                matches.append("{0}".format(i - len_pat))
-                numMatches +=1
-
-            elif zForw[i] >= 1: # at least one character match
-                opp_index = len_z_arr - i + 2
-
-                # number of characters after the transposition error that match sum to the length of the pattern.
-                if zBack[opp_index] == len_pat - zForw[i] - 2:
-
-                    tranpos_err = i + zForw[i] - len_pat - 1
-                    # checking if the transposition error characters match when switched
-                    if (string[tranpos_err + 1] == pat[zForw[i]]) and ((string[tranpos_err] == pat[zForw[i] + 1])):
-                        matches.append("{0} {1}".format(i - len_pat, i - len_pat + zForw[i]))
-                        numMatches +=1
-
-            else: # zForw[i] == 0 
-                opp_index = len_z_arr - i + 2 # the start of the pattern didnt match, check if the rear of the pattern matches
-                if zBack[opp_index] == len_pat - 2:
-                    # check the first two chars switched with the first two chars of pat
-                    if string[i - len_pat - 1] == pat[1] and string[i - len_pat] == pat[0]:
-                        matches.append("{0} {0}".format(i - len_pat))
-                        numMatches +=1
-
-        # writing output to output_q1.txt
-    file = open("output_q1.txt", "w")
-    file.write("{0}\n".format(numMatches))
-    for v in matches:
-        file.write(v + "\n")
-    file.close()
\ No newline at end of file
+    if chunk_size > 0:
+        if patFileContents:
+            matches = streamTranspositionMatches(textFile, patFileContents[0], chunk_size)
+
+    else:
+        # the text is memory mapped, ASCII blocks of it are matched as bytes and any others decoded
+        string = read_mmap(textFile)
+
+        # both text and pattern files need to have content
+        if string and patFileContents:
+            matches = iterTranspositionMatches(string, patFileContents[0])
+
+    # writing output to output_q1.txt as the matches are found
+    write_matches("output_q1.txt", matches)
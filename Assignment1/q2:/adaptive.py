@@ -0,0 +1,252 @@
+import os
+import sys
+import json
+
+# zarray.py and textfile.py are shared between q1 and q2 and live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from textfile import ENCODING, charPositions
+from zarray import Zalg, encode, prefixMatches
+from q2 import iterSearch, read_file, read_mmap, write_positions
+
+# thresholds written by calibrate.py
+CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calibration.json")
+
+# largest text still counted as small, where preprocessing cost matters most
+SMALL_TEXT = 4096
+
+def horspool(string, pat):
+    """
+    Horspool's simplification of Boyer-Moore, only the bad character shift of the
+    text character under the last position of the pattern is used.
+    Yields the 1 based position of each match.
+
+    Time Complexity: O(n * m) worst case, O(n / m) on average for large alphabets.
+    Space Complexity: O(m)
+    """
+    len_string = len(string)
+    len_pat = len(pat)
+    if len_pat == 0:
+        return
+
+    shift = {}
+    for i in range(len_pat - 1):
+        shift[pat[i]] = len_pat - 1 - i
+
+    last = pat[-1]
+    j = 0
+    while j <= len_string - len_pat:
+        c = string[j + len_pat - 1]
+        if c == last and string[j : j + len_pat] == pat:
+            yield j + 1
+        j += shift.get(c, len_pat)
+
+def zScan(string, pat):
+    """
+    Exact matching with the z algorithm, a match is where the prefix of the pattern
+    matched at a position is the whole pattern. Yields the 1 based position of each match.
+
+    Time Complexity: O(m + n)
+    Space Complexity: O(n)
+    """
+    len_pat = len(pat)
+    if len_pat == 0:
+        return
+
+    zVals = prefixMatches(pat, string)
+    for s in range(len(string) - len_pat + 1):
+        if zVals[s] == len_pat:
+            yield s + 1
+
+def maxSuffix(pat, reverse: bool = False):
+    """
+    Start and period of the maximal suffix of the pattern for the usual order,
+    or for the reversed order when reverse is set. The start is one less than the
+    index of the suffix, so -1 is the whole pattern.
+    """
+    ms = -1
+    j = 0
+    k = 1
+    p = 1
+
+    while j + k < len(pat):
+        a = pat[j + k]
+        b = pat[ms + k]
+        if a == b:
+            if k != p:
+                k += 1
+            else:
+                j += p
+                k = 1
+        elif (a < b) != reverse:    # the suffix starting at ms stays the largest
+            j += k
+            k = 1
+            p = j - ms
+        else:   # a larger suffix starts at j
+            ms = j
+            j = ms + 1
+            k = 1
+            p = 1
+
+    return ms, p
+
+def twoWay(string, pat):
+    """
+    Crochemore-Perrin two-way matching. The pattern is cut at a critical factorisation,
+    the right part is compared left to right and the left part right to left, and
+    memory of the matched prefix of a periodic pattern keeps the scan linear.
+    Yields the 1 based position of each match.
+
+    Time Complexity: O(m + n)
+    Space Complexity: O(1)
+    """
+    len_string = len(string)
+    len_pat = len(pat)
+    if len_pat == 0:
+        return
+
+    # critical factorisation from the larger of the two maximal suffixes
+    i, p = maxSuffix(pat)
+    j, q = maxSuffix(pat, True)
+    if i > j:
+        ell = i
+        per = p
+    else:
+        ell = j
+        per = q
+
+    # the pattern is periodic when its left part repeats one period later
+    periodic = per + ell + 1 <= len_pat
+    k = 0
+    while periodic and k <= ell:
+        if pat[k] != pat[k + per]:
+            periodic = False
+        k += 1
+
+    j = 0
+    if periodic:
+        memory = -1
+        while j <= len_string - len_pat:
+            i = max(ell, memory) + 1
+            while i < len_pat and pat[i] == string[i + j]:
+                i += 1
+
+            if i >= len_pat:
+                i = ell
+                while i > memory and pat[i] == string[i + j]:
+                    i -= 1
+                if i <= memory:
+                    yield j + 1
+                j += per
+                memory = len_pat - per - 1
+
+            else:
+                j += i - ell
+                memory = -1
+
+    else:
+        per = max(ell + 1, len_pat - ell - 1) + 1
+        while j <= len_string - len_pat:
+            i = ell + 1
+            while i < len_pat and pat[i] == string[i + j]:
+                i += 1
+
+            if i >= len_pat:
+                i = ell
+                while i >= 0 and pat[i] == string[i + j]:
+                    i -= 1
+                if i < 0:
+                    yield j + 1
+                j += per
+
+            else:
+                j += i - ell
+
+# the engines the front-end chooses between
+ENGINES = {
+    "boyer-moore": iterSearch,
+    "horspool": horspool,
+    "z": zScan,
+    "two-way": twoWay,
+}
+
+def patternClass(pat):
+    """
+    Groups a pattern by the property that most changes which engine is fastest.
+    "periodic" patterns repeat their smallest period at least twice, "small-alphabet"
+    patterns use at most 4 distinct characters and everything else is "general".
+    """
+    len_pat = len(pat)
+    zVals = Zalg(encode(pat))
+    period = len_pat
+    for i in range(1, len_pat):
+        if i + zVals[i] == len_pat:
+            period = i
+            break
+
+    if len_pat > 1 and 2 * period <= len_pat:
+        return "periodic"
+    if len(set(pat)) <= 4:
+        return "small-alphabet"
+    return "general"
+
+def loadCalibration(file: str = CALIBRATION_FILE):
+    """
+    Reads the engine thresholds produced by calibrate.py.
+    """
+    f = open(file, 'r')
+    calibration = json.load(f)
+    f.close()
+
+    return calibration
+
+_calibration = None
+
+def chooseEngine(string, pat, calibration: dict = None):
+    """
+    Name of the engine to run for the pattern and text. The calibration lists, for each
+    pattern class and text size, the fastest engine up to each pattern length.
+    """
+    global _calibration
+    if calibration is None:
+        if _calibration is None:
+            _calibration = loadCalibration()
+        calibration = _calibration
+
+    size = "small" if len(string) <= SMALL_TEXT else "large"
+    rows = calibration["thresholds"][patternClass(pat)][size]
+
+    len_pat = len(pat)
+    for max_len, engine in rows:
+        if max_len is None or len_pat <= max_len:
+            return engine
+
+    return "boyer-moore"
+
+def adaptiveSearch(string, pat, calibration: dict = None):
+    """
+    Runs the engine chosen for the query. Returns the engine name and a generator of
+    the 1 based match positions, the same positions search gives.
+    """
+    engine = chooseEngine(string, pat, calibration)
+
+    # a bytes-like string is UTF-8 text, matched against the UTF-8 encoded pattern
+    # with the byte positions turned into character positions, as iterSearch does
+    if engine != "boyer-moore" and not isinstance(string, str):
+        return engine, charPositions(string, ENGINES[engine](string, pat.encode(ENCODING)))
+
+    return engine, ENGINES[engine](string, pat)
+
+if __name__ == "__main__":
+    # reading in file names
+    _, textFile, patFile = sys.argv
+
+    string = read_mmap(textFile)
+    patFileContents = read_file(patFile)
+
+    matches = []
+    if string and patFileContents:
+        engine, matches = adaptiveSearch(string, patFileContents[0])
+        print(engine)
+
+    # writing output to output_q2.txt as the matches are found
+    write_positions("output_q2.txt", matches)
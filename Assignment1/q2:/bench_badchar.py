@@ -0,0 +1,63 @@
+"""
+Benchmark of the bad character table in q2.py against the previous len_pat x 26 table.
+Reports the memory of the table (peak traced allocation while building it),
+the build time and the search time for long patterns and large alphabets.
+
+usage: python bench_badchar.py [m] [n]
+"""
+import sys
+import time
+import random
+import tracemalloc
+from q2 import extBadChar, search
+
+ALPHABET_SIZE = 26
+UNICODE_A = 97
+
+def tableBadChar(pat: str, len_pat: int):
+    """
+    The previous len_pat x 26 list of lists, kept here for comparison. Only works on a-z.
+    """
+    badChars = [[-1]*ALPHABET_SIZE for i in range(len_pat)]
+    for i in range(len_pat - 1):
+        for j in range(ALPHABET_SIZE):
+            badChars[i+1][j] = badChars[i][j]
+        if badChars[i+1][ord(pat[i]) - UNICODE_A] < i:
+            badChars[i+1][ord(pat[i]) - UNICODE_A] = i
+    return badChars
+
+def measure(name: str, func):
+    """
+    Runs func once under tracemalloc for the peak allocation and once more for the time.
+    """
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    print("{0:<40} {1:>10.2f} MB {2:>10.3f} s".format(name, peak / 1e6, elapsed))
+
+if __name__ == "__main__":
+    m = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 1000000
+
+    random.seed(0)
+    letters = ''.join(random.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(n))
+    letters_pat = letters[n // 2 : n // 2 + m]
+    binary = bytes(random.getrandbits(8) for _ in range(n))
+    binary_pat = binary[n // 2 : n // 2 + m].decode('latin-1')
+    unicode = ''.join(chr(random.randrange(0x4e00, 0x9fff)) for _ in range(n))
+    unicode_pat = unicode[n // 2 : n // 2 + m]
+
+    print("m = {0}, n = {1}".format(m, n))
+    measure("26 column table, a-z", lambda: tableBadChar(letters_pat, m))
+    measure("occurance arrays, a-z", lambda: extBadChar(letters_pat, m))
+    measure("occurance arrays, bytes", lambda: extBadChar(binary_pat.encode('latin-1'), m))
+    measure("occurance arrays, CJK", lambda: extBadChar(unicode_pat, m))
+    measure("search, a-z", lambda: search(letters, letters_pat))
+    measure("search, bytes", lambda: search(binary, binary_pat))
+    measure("search, CJK", lambda: search(unicode, unicode_pat))
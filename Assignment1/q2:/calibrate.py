@@ -0,0 +1,148 @@
+"""
+Calibration benchmark for the adaptive search front-end in adaptive.py.
+Times every engine over a grid of pattern classes, pattern lengths and text sizes,
+and writes the fastest engine for each range of pattern lengths to calibration.json.
+
+usage: python calibrate.py [large text size] [repeats]
+"""
+import sys
+import json
+import time
+import random
+import statistics
+import q2
+from adaptive import ENGINES, CALIBRATION_FILE, SMALL_TEXT, patternClass
+
+LENGTHS = [1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64, 128, 256]
+
+# relative slowdown charged for each change of engine, so that timing noise does not switch engines
+MARGIN = 0.15
+
+def makeText(pattern_class: str, n: int):
+    """
+    Text whose patterns fall in the class, random letters, DNA or a noisy periodic string.
+    """
+    if pattern_class == "general":
+        return ''.join(random.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(n))
+    if pattern_class == "small-alphabet":
+        return ''.join(random.choice('acgt') for _ in range(n))
+
+    text = list(('aab' * (n // 3 + 1))[:n])
+    for _ in range(n // 50):    # break the period now and then
+        text[random.randrange(n)] = 'b'
+    return ''.join(text)
+
+def makePattern(pattern_class: str, text: str, m: int):
+    """
+    Pattern of length m in the class, taken from the text so that it has matches,
+    or None if none is found.
+    """
+    for _ in range(200):
+        if pattern_class == "periodic":
+            pat = ('aab' * (m // 3 + 1))[:m]
+        else:
+            start = random.randrange(len(text) - m + 1)
+            pat = text[start : start + m]
+
+        if patternClass(pat) == pattern_class:
+            return pat
+
+    return None
+
+def timeEngine(engine, string: str, pat: str, repeats: int):
+    """
+    Median time of the engine over the repeats, which a slow outlier run does not move.
+    The pattern cache is cleared first so Boyer-Moore pays for its preprocessing as a new query would.
+    """
+    times = []
+    for _ in range(repeats):
+        q2.PATTERN_CACHE.clear()
+        start = time.perf_counter()
+        for _ in engine(string, pat):
+            pass
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+def chooseRows(measured: list):
+    """
+    Rows of [largest length, engine] from the median times of each pattern length, a list of
+    (length, {engine: seconds}) in increasing length. Each engine covers a single range of
+    lengths, and the engines are picked to keep the total slowdown against the fastest engine
+    at each length smallest, where every change of engine also counts as a MARGIN slowdown.
+    So an engine only takes over when it is faster by more than the margin, and one noisy
+    length does not split a range. The last row covers every longer pattern.
+    """
+    # best[(engine, used)] is the (cost, rows) of the cheapest choice for the lengths so far
+    # that ends with engine, used being the engines that already had their range
+    best = {}
+    for m, times in measured:
+        fastest = min(times.values())
+        slowdown = {name: seconds / fastest - 1 for name, seconds in times.items()}
+
+        step = {}
+        for name in times:
+            if not best:    # the first length
+                candidates = [(slowdown[name], [[m, name]], frozenset([name]))]
+            else:
+                candidates = []
+                for (last, used), (cost, rows) in best.items():
+                    if name == last:
+                        candidates.append((cost + slowdown[name], rows[:-1] + [[m, name]], used))
+                    elif name not in used:
+                        candidates.append((cost + MARGIN + slowdown[name], rows + [[m, name]], used | {name}))
+
+            for cost, rows, used in candidates:
+                key = (name, used)
+                if key not in step or cost < step[key][0]:
+                    step[key] = (cost, rows)
+        best = step
+
+    if not best:
+        return [[None, "boyer-moore"]]
+
+    _, rows = min(best.values(), key=lambda choice: choice[0])
+    rows[-1][0] = None
+    return rows
+
+def calibrate(large: int, repeats: int):
+    """
+    Fastest engine for each class, text size and pattern length, see chooseRows.
+    """
+    thresholds = {}
+    timings = []
+
+    for pattern_class in ("general", "small-alphabet", "periodic"):
+        thresholds[pattern_class] = {}
+
+        for size, n in (("small", SMALL_TEXT), ("large", large)):
+            text = makeText(pattern_class, n)
+            measured = []
+
+            for m in LENGTHS:
+                pat = makePattern(pattern_class, text, m) if m < n else None
+                if pat is None:
+                    continue
+
+                times = {}
+                for name, engine in ENGINES.items():
+                    times[name] = timeEngine(engine, text, pat, repeats)
+                measured.append((m, times))
+                timings.append({"class": pattern_class, "size": size, "n": n, "m": m, "seconds": times})
+                print("{0:<15} {1:<6} m={2:<4} {3}".format(pattern_class, size, m, min(times, key=times.get)))
+
+            thresholds[pattern_class][size] = chooseRows(measured)
+
+    return {"large_text": large, "small_text": SMALL_TEXT, "repeats": repeats, "margin": MARGIN,
+            "thresholds": thresholds, "timings": timings}
+
+if __name__ == "__main__":
+    large = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+
+    random.seed(0)
+    calibration = calibrate(large, repeats)
+
+    f = open(CALIBRATION_FILE, 'w')
+    json.dump(calibration, f, indent=1)
+    f.close()
@@ -0,0 +1,31 @@
+import os
+import sys
+
+# zarray.py and textfile.py are shared between q1 and q2 and live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from textfile import parallelShards
+from q2 import search, read_file, write_positions
+
+def parallelSearch(file: str, pat: str, workers: int = None, shards_per_worker: int = 4):
+    """
+    Runs the Boyer-Moore search over shards of the text file in a process pool
+    (see textfile.parallelShards). The matches are the 1 based character positions
+    search gives over the whole file.
+
+    Time Complexity: O((n + s * m) / p), with s shards and p workers.
+    """
+    return parallelShards(file, pat, search, search, workers, shards_per_worker)
+
+if __name__ == "__main__":
+    # reading in file names and an optional number of worker processes
+    textFile, patFile = sys.argv[1], sys.argv[2]
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    patFileContents = read_file(patFile)
+
+    matches = []
+    if patFileContents:
+        matches = parallelSearch(textFile, patFileContents[0], workers)
+
+    # writing output to output_q2.txt
+    write_positions("output_q2.txt", matches)
@@ -0,0 +1,118 @@
+import os
+import sys
+
+# zarray.py and textfile.py are shared between q1 and q2 and live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from textfile import ENCODING, charPositions
+from q2 import iterSearch, read_file, read_mmap, write_positions
+
+# NumPy is optional, without it the prefilter falls back to the plain Boyer-Moore search
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# number of alignments filtered at once, bounds the size of the temporary masks
+BLOCK_SIZE = 1 << 24
+
+# bytes of text sampled to estimate how rare each byte is
+SAMPLE_SIZE = 1 << 20
+
+def latin1(string):
+    """
+    The string as bytes-like data, or None when a str has characters wider than a byte.
+    """
+    if not isinstance(string, str):
+        return string
+
+    try:
+        return string.encode('latin-1')
+    except UnicodeEncodeError:
+        return None
+
+def probePositions(text, pat: bytes):
+    """
+    Pattern positions compared for every alignment: the last byte, as in Boyer-Moore,
+    then the byte of the pattern that is rarest in a sample of the text and the first byte.
+    """
+    counts = np.bincount(text[:SAMPLE_SIZE], minlength=256)
+    rarest = min(range(len(pat)), key=lambda r: counts[pat[r]])
+
+    probes = [len(pat) - 1]
+    for r in (rarest, 0):
+        if r not in probes:
+            probes.append(r)
+
+    return probes
+
+def prefilterSearch(string, pat, block_size: int = BLOCK_SIZE):
+    """
+    Vectorised candidate filtering in front of Boyer-Moore verification. The text is viewed
+    as a NumPy uint8 array and the alignments whose probe bytes (see probePositions) all
+    agree with the pattern are found with bulk comparisons, block_size alignments at a time.
+    Only those candidates are verified against the whole pattern.
+    Yields the same 1 based positions as iterSearch, which is used directly when NumPy is
+    missing or the text or pattern does not fit in single bytes.
+
+    Time Complexity: O(n) vectorised work plus O(m) per candidate.
+    Space Complexity: O(block_size)
+    """
+    # a bytes-like string is UTF-8 text, searched for the UTF-8 encoded pattern
+    # with the byte positions turned into character positions, as iterSearch does
+    utf8 = not isinstance(string, str) and isinstance(pat, str)
+    if utf8:
+        buf = string
+        pat_buf = pat.encode(ENCODING)
+    else:
+        buf = latin1(string)
+        pat_buf = latin1(pat)
+
+    if np is None or buf is None or pat_buf is None or not pat_buf:
+        yield from iterSearch(string, pat)
+        return
+
+    if utf8:
+        yield from charPositions(string, prefilterBytes(buf, pat_buf, block_size))
+    else:
+        yield from prefilterBytes(buf, pat_buf, block_size)
+
+def prefilterBytes(buf, pat: bytes, block_size: int):
+    """
+    The candidate filtering and verification of prefilterSearch over bytes-like text,
+    yielding the 1 based byte positions of the matches.
+    """
+    view = memoryview(buf)
+    text = np.frombuffer(view, dtype=np.uint8)
+    len_pat = len(pat)
+    windows = len(text) - len_pat + 1
+    if windows <= 0:
+        return
+
+    probes = probePositions(text, pat)
+
+    for a in range(0, windows, block_size):
+        b = min(a + block_size, windows)
+
+        # alignments in [a, b) where every probe byte matches
+        mask = text[a + probes[0] : b + probes[0]] == pat[probes[0]]
+        for r in probes[1:]:
+            mask &= text[a + r : b + r] == pat[r]
+
+        # verify the remaining candidates against the whole pattern
+        for s in np.flatnonzero(mask).tolist():
+            if view[a + s : a + s + len_pat] == pat:
+                yield a + s + 1
+
+if __name__ == "__main__":
+    # reading in file names
+    _, textFile, patFile = sys.argv
+
+    string = read_mmap(textFile)
+    patFileContents = read_file(patFile)
+
+    matches = []
+    if string and patFileContents:
+        matches = prefilterSearch(string, patFileContents[0])
+
+    # writing output to output_q2.txt as the matches are found
+    write_positions("output_q2.txt", matches)
@@ -1,83 +1,54 @@
+import os
 import sys
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import islice
 
-# Global variables
-ALPHABET_SIZE = 26
-UNICODE_A = 97
-
-def Zalg(string: str):
-    n = len(string)
-    zVal = [0] * n
-
-    # initialise left and right (z box) and k
-    l = 0
-    r = 0
-    k = 0
-
-    # iterate through the string
-    for i in range(1, n):
-        if i > r: # nothing has been matched yet
-            # making z box the current character at i
-            l = i 
-            r = i
-
-            # expanding the z box by increasing r for each matched character
-            while r < n and string[r] == string[r-l]:
-                r += 1
-            
-            zVal[i] += r-l  # set the z val as the size of the z box
-            r -= 1  
-        
-        else: # inside the z box
-            k = i - l   # index inside the z box
-
-            if zVal[k] < r - i + 1: # case 2a, not reached end of z box, copy already computed z values across.
-                zVal[i] = zVal[k]
-
-            else: # case 2b, the number of matches of this z box exceeds what is computed at the start
-                # start from r and check the next chars
-                l = i
-
-                while r < n and string[r] == string[r-l]: # compare chars
-                    r += 1  # extend z box
-                
-                zVal[i] += r-l  # record the length of z box
-                r -= 1    
-
-    return zVal
+# zarray.py and textfile.py are shared with q1 and live one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from textfile import ENCODING, read_mmap, charCount, charPositions
+from zarray import Zalg, encode
 
 def extBadChar(pat: str, len_pat: int):
     """
-    2d array where the rows is the length of the pattern and the columns
-    are each letter of the alphabet. A value of -1 represents no pre occuring 
-    letter in the pattern corresponding to that index and all other values > -1
-    represent where its right most occurance of that letter is in the pattern, starting from 0.
+    Bad character table over any alphabet. Each character of the pattern maps to
+    the sorted array of the indexes where it occurs, so the table takes O(m) space
+    whatever the size of the alphabet. The keys are the elements of pat, characters
+    for a str and ints for bytes, so the table works on binary data as well.
     """
 
-    # create bad character 2d array
-    badChars = [[-1]*ALPHABET_SIZE for i in range(len_pat)]
+    badChars = {}
+    for i in range(len_pat):
+        if pat[i] not in badChars:
+            badChars[pat[i]] = array('i')
+        badChars[pat[i]].append(i)
 
-    # iterate through each row
-    for i in range(len_pat - 1):
+    return badChars
 
-        # update next row with the previous row
-        for j in range(ALPHABET_SIZE):
-            badChars[i+1][j] = badChars[i][j]
+def badCharIndex(badChars: dict, c, i: int):
+    """
+    The right most occurance of c in pat[0..i-1], or -1 if c does not occur there.
+    The same value as row i, column c of the previous len_pat x 26 table.
 
-        # update the next char in their row and column
-        if badChars[i+1][ord(pat[i]) - UNICODE_A] < i: # update the specific column of the char to i
-            badChars[i+1][ord(pat[i]) - UNICODE_A] = i
+    Time Complexity: O(log m)
+    """
+    occurances = badChars.get(c)
+    if occurances is None:
+        return -1
 
-    return badChars
+    j = bisect_left(occurances, i)    # number of occurances before i
+    return occurances[j - 1] if j > 0 else -1
 
 def goodSuffix(pat: str, len_pat: int):
     """
     A good suffix array of length of the pattern + 1. Each value in the array refers 
     to the index of the right endpoint of the right most substring that matches the suffix in a given range.
-    The indexing starts from 1.
+    The indexing starts from 1. The values are kept in an int32 array, 4 bytes each.
     """
 
-    gs = [0] * (len_pat + 1)
-    zArr = Zalg(pat[::-1])[::-1]
+    gs = array('i', [0]) * (len_pat + 1)
+    zArr = Zalg(encode(pat)[::-1])[::-1]
 
     # iterating through each zArr index
     for i in range(len_pat - 1):
@@ -93,10 +64,11 @@ def matchedPrefix(pat: str, len_pat: int):
     """
     The matched prefix is an array of size length of the pattern + 1, containing 
     values corresponding to the longest suffix of pat[i:] that is also a prefix of pat.
+    The values are kept in an int32 array, 4 bytes each.
     """
 
-    mp = [0] * (len_pat + 1)
-    zArr = Zalg(pat)[::-1]
+    mp = array('i', [0]) * (len_pat + 1)
+    zArr = Zalg(encode(pat))[::-1]
     longest = 0
 
     for i in range(len_pat):
@@ -109,26 +81,143 @@ def matchedPrefix(pat: str, len_pat: int):
 
     return mp
 
-def search(string: str, pat: str):
+class CompiledPattern:
+    """
+    The Boyer-Moore preprocessing of a pattern, the bad character table, good suffix
+    and matched prefix arrays, computed once and reused by every search with it.
+    A str pattern is searched for in str text and a bytes pattern in bytes-like text.
+    """
+    def __init__(self, pat):
+        self.pat = pat
+        self.len_pat = len(pat)
+        self.badChar = extBadChar(pat, self.len_pat)
+        self.gs = goodSuffix(pat, self.len_pat)
+        self.mp = matchedPrefix(pat, self.len_pat)
+
+        # memory held by the tables, gs, mp and the occurance arrays store their values
+        # inline so getsizeof counts them, the keys of badChar are shared small objects
+        self.nbytes = sys.getsizeof(self.gs) + sys.getsizeof(self.mp) + sys.getsizeof(self.badChar)
+        for occurances in self.badChar.values():
+            self.nbytes += sys.getsizeof(occurances)
+
+class PatternCache:
+    """
+    Least recently used cache of compiled patterns. Patterns are evicted when
+    there are more than maxsize of them or their tables hold more than max_bytes.
+    """
+    def __init__(self, maxsize: int = 1024, max_bytes: int = 64 << 20):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, pat):
+        """
+        The compiled pattern for pat, compiling and caching it on a miss.
+        """
+        key = pat if isinstance(pat, (str, bytes)) else tuple(pat) # arrays are not hashable
+
+        compiled = self.entries.get(key)
+        if compiled is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return compiled
+
+        self.misses += 1
+        compiled = CompiledPattern(pat)
+        self.entries[key] = compiled
+        self.nbytes += compiled.nbytes
+
+        # evict the least recently used patterns, always keeping the new one
+        while len(self.entries) > 1 and (len(self.entries) > self.maxsize or self.nbytes > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+        return compiled
+
+    def resize(self, maxsize: int = None, max_bytes: int = None):
+        """
+        Changes the limits of the cache, evicting patterns that no longer fit.
+        """
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+        while self.entries and (len(self.entries) > self.maxsize or self.nbytes > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def clear(self):
+        """
+        Removes every pattern and resets the hit and miss counters.
+        """
+        self.entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+# patterns compiled by search
+PATTERN_CACHE = PatternCache()
+
+def compilePattern(pat):
+    """
+    The compiled pattern for pat, from the module cache when it has been compiled before.
+    """
+    return PATTERN_CACHE.get(pat)
+
+def iterSearch(string: str, pat):
     """
     Implementation of the Boyer-Moore algorithm, which utilises 
     the preprocessing to achieve a fast search. This function also uses 
     Galil's optimisation to reduce the number of comparisons.
+    The string can be a str or a bytes-like buffer. A str pattern is searched for in a
+    bytes-like string, such as the memoryview from read_mmap, as UTF-8 text: the UTF-8 encoded
+    pattern is matched byte by byte and the byte positions of its matches are turned into
+    character positions as the scan goes (see textfile.charPositions).
+    The 1 based position of each match is yielded as soon as it is found.
+    pat is a str or a CompiledPattern, the preprocessing is taken from the pattern cache
+    so repeated searches with the same pattern skip it.
+    """
+
+    if isinstance(pat, CompiledPattern):
+        compiled = pat
+        pat = compiled.pat
+    else:
+        compiled = None
+
+    # a bytes-like string is indexed as ints, so compare it against the encoded pattern
+    if not isinstance(string, str) and isinstance(pat, str):
+        yield from charPositions(string, boyerMoore(string, compilePattern(pat.encode(ENCODING))))
+        return
+    elif isinstance(string, str) and not isinstance(pat, str):
+        pat = pat.decode('latin-1')
+        compiled = None
+
+    # pre-processing
+    if compiled is None:
+        compiled = compilePattern(pat)
+
+    yield from boyerMoore(string, compiled)
+
+def boyerMoore(string, compiled: CompiledPattern):
     """
+    The Boyer-Moore scan of iterSearch, over a string indexed the same way as the compiled
+    pattern, characters for a str and ints for bytes. Yields the 1 based position of each match.
+    """
+    pat = compiled.pat
+    badChar = compiled.badChar
+    gs = compiled.gs
+    mp = compiled.mp
 
     len_string = len(string)
     len_pat = len(pat)
 
-    matches = []
-
     # base case
     if len_string < len_pat:
-        return matches
-
-    # pre-processing
-    badChar = extBadChar(pat, len_pat)
-    gs = goodSuffix(pat, len_pat)
-    mp = matchedPrefix(pat, len_pat)
+        return
 
     k = len_pat - 1 # alignment of end of pat relative to string
 
@@ -167,7 +256,7 @@ def search(string: str, pat: str):
                 j -= 1
 
         if i == -1: # iterated through all of pat
-            matches.append(k - len_pat + 2)
+            yield k - len_pat + 2
 
             # update k
             if len_pat > 1:
@@ -182,7 +271,7 @@ def search(string: str, pat: str):
             galil_k_start = -1
 
             # calculate the bad character shift
-            badCharVal = badChar[i][ord(string[j]) - UNICODE_A]
+            badCharVal = badCharIndex(badChar, string[j], i)
             if badCharVal == -1:
                 badCharShift = i + 1
             else:
@@ -191,23 +280,163 @@ def search(string: str, pat: str):
             # calculate the good suffix rule shift
             if gs[i+1] == 0:
                 shift = len_pat - mp[i+1]
-                galil_k_mp = mp[i+1]
-
-            elif gs[i+1] > 0:
+            else:
                 shift = len_pat - gs[i+1]
-                galil_k_start = gs[i+1] - len_pat + i + 1
-                galil_k_stop = gs[i+1]
-            
+
+            # Galil's optimisation only holds when the good suffix shift is taken,
+            # a longer bad character shift moves past the substring known to match
+            if shift >= badCharShift:
+                if gs[i+1] == 0:
+                    galil_k_mp = mp[i+1]
+                else:
+                    galil_k_start = gs[i+1] - len_pat + i + 1
+                    galil_k_stop = gs[i+1]
+
             finalShift = max(shift, badCharShift)
 
             k += finalShift
-    return matches
+
+def search(string: str, pat, limit: int = None):
+    """
+    List of the match positions from iterSearch, stopping after the first limit matches when given.
+    """
+    return list(islice(iterSearch(string, pat), limit))
+
+def countMatches(string: str, pat):
+    """
+    Number of matches, without keeping the positions or formatting them.
+    """
+    count = 0
+    for _ in iterSearch(string, pat):
+        count += 1
+
+    return count
+
+def hasMatch(string: str, pat):
+    """
+    Whether the pattern occurs at all, the scan stops at the first match.
+    """
+    for _ in iterSearch(string, pat):
+        return True
+
+    return False
+
+def wildcardFragments(pat: str, wildcard: str = "."):
+    """
+    Splits a pattern into its literal fragments, the maximal runs without a wildcard,
+    as (offset, fragment) pairs where offset is the index of the fragment in pat.
+    """
+    fragments = []
+    start = 0
+    for piece in pat.split(wildcard):
+        if piece:
+            fragments.append((start, piece))
+        start += len(piece) + 1
+
+    return fragments
+
+def intersectSorted(iterators: list):
+    """
+    Merge-join of increasing iterators, yielding the values that appear in all of them.
+    The iterator behind the current maximum is never advanced, so each value of
+    each iterator is looked at once.
+    """
+    heads = []
+    for it in iterators:
+        v = next(it, None)
+        if v is None:
+            return
+        heads.append(v)
+
+    while True:
+        target = max(heads)
+        agree = True
+
+        # advance every iterator up to the target
+        for idx in range(len(iterators)):
+            while heads[idx] < target:
+                heads[idx] = next(iterators[idx], None)
+                if heads[idx] is None:
+                    return
+            if heads[idx] > target:
+                agree = False
+
+        if agree:
+            yield target
+            heads[0] = next(iterators[0], None)
+            if heads[0] is None:
+                return
+
+def fragmentStarts(string, fragment: str, offset: int, last_start: int):
+    """
+    Starts of the whole pattern implied by each match of a fragment at offset in it.
+    last_start is None when no start can run off the end of the string.
+    """
+    for v in iterSearch(string, fragment):
+        if v > offset and (last_start is None or v - offset <= last_start):
+            yield v - offset
+
+def iterWildcardSearch(string, pat: str, wildcard: str = "."):
+    """
+    Search for a pattern where each wildcard matches any one character, with any number
+    of wildcards anywhere in the pattern. Each literal fragment is searched for with
+    Boyer-Moore, its matches are turned into starts of the whole pattern and the sorted
+    starts of all fragments are merge-joined. Starts where the pattern would run off either
+    end of the string are dropped. The 1 based starts are yielded in increasing order.
+
+    Time Complexity: O(f * n + z), for f fragments and z matches of the fragments.
+    Space Complexity: O(m), the fragment searches are lazy.
+    """
+    len_pat = len(pat)
+
+    # last 1 based start that fits, only needed when the pattern ends in a wildcard as otherwise
+    # its last fragment can not match too close to the end. The characters of a bytes-like
+    # string are only counted in that case.
+    last_start = None
+    if not pat or pat.endswith(wildcard):
+        length = len(string) if isinstance(string, str) else charCount(string, 0, len(string))
+        last_start = length - len_pat + 1
+
+    fragments = wildcardFragments(pat, wildcard)
+    if not fragments:   # only wildcards, every start that fits matches
+        yield from range(1, last_start + 1)
+        return
+
+    # the longest fragment usually has the fewest matches, so let it lead the join
+    fragments.sort(key=lambda fragment: -len(fragment[1]))
+
+    starts = [fragmentStarts(string, fragment, offset, last_start) for offset, fragment in fragments]
+
+    yield from intersectSorted(starts)
+
+def wildcardSearch(string, pat: str, wildcard: str = "."):
+    """
+    List of the match positions from iterWildcardSearch.
+    """
+    return list(iterWildcardSearch(string, pat, wildcard))
+
+def write_positions(file: str, matches, batch_size: int = 1 << 16):
+    """
+    Writes one match position per line, joining batch_size lines into one write
+    so a generator of matches is streamed out in constant memory.
+    """
+    f = open(file, "w")
+    batch = []
+    for v in matches:
+        batch.append(str(v))
+        if len(batch) == batch_size:
+            f.write("\n".join(batch) + "\n")
+            batch = []
+
+    if batch:
+        f.write("\n".join(batch) + "\n")
+    f.close()
 
 def read_file(file: str):
     """
     reading lines within a file.
     """
-    f = open(file, 'r')
+    f = open(file, 'r', encoding=ENCODING)
     lines = f.readlines()
     f.close()
 
@@ -217,59 +446,25 @@ if __name__ == "__main__":
     # reading in file names
     _, textFile, patFile = sys.argv
 
-    # obtaining content from the files into a list
-    textFileContents = read_file(textFile)
+    # the text is memory mapped and searched as UTF-8 bytes (see iterSearch),
+    # the pattern is read into a list
+    string = read_mmap(textFile)
     patFileContents = read_file(patFile)
 
     matches = []
 
     # both text and pattern files need to have content
-    if textFileContents and patFileContents:
-        string = textFileContents[0]
+    if string and patFileContents:
         pat = patFileContents[0]
         
-        # pat only contains a dot
-        if pat == ".":
-            for i in range(len(string)):
-                matches.append(i+1)
-
-        # pat contains characters and a dot
-        elif "." in pat:
-
-            #  split pat into two parts, seperated by "."
-            pat1, pat2 = pat.split(".")
-
-            matches1 = search(string, pat1)
-            matches2 = search(string, pat2)
-
-            len_pat1 = len(pat1)
-
-            # iterating through the matches and pairing both patterns
-            if pat[0] == ".": # dot is at the start
-                for v in matches2:
-                    if v != 0:
-                        matches.append(v - 1)
-
-            elif pat[-1] == ".": # "." is at the end
-                len_string = len(string)
-                for v in matches1:
-                    if v + len_pat1 != len_string: # ensure that there is space for the "."
-                        matches.append(v)
-                
-            else: # "." is in the middle
-                for i in range(len(matches1)):
-                    if matches1[i] + len_pat1 + 1 in matches2:
-                        matches.append(matches1[i])
+        # pat contains at least one dot
+        if "." in pat:
+            matches = iterWildcardSearch(string, pat)
 
         # pat only contains characters
         else:
-            matches = search(string, pat)
-            for v in matches:
-                matches.append(v)
+            matches = iterSearch(string, pat)
 
-    # writing output to output_q1.txt
-    file = open("output_q2.txt", "w")
-    for v in matches:
-        file.write("{0}\n".format(v))
-    file.close()
+    # writing output to output_q2.txt as the matches are found
+    write_positions("output_q2.txt", matches)
 
@@ -0,0 +1,225 @@
+import os
+import re
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+
+# encoding of the text and pattern files
+ENCODING = 'utf-8'
+
+# bytes of text handled at a time when checking, counting or decoding it
+SCAN_BLOCK = 1 << 20
+
+# any byte that is not ASCII, searched for without copying the text
+NON_ASCII = re.compile(b'[\x80-\xff]')
+
+# UTF-8 continuation bytes, every other byte starts a character
+CONTINUATION = bytes(range(0x80, 0xC0))
+
+def read_mmap(file: str):
+    """
+    The UTF-8 bytes of a file as a read only memoryview of a memory map of it.
+    No data is read up front, so opening takes the same time whatever the size of the file,
+    and pages are only read in as a search reaches them. The map stays open for as long as the
+    memoryview is referenced. The matchers still report character positions, they count the
+    characters as they scan (see charPositions and textBlocks). Line endings are kept as they are.
+    """
+    f = open(file, 'rb')
+    size = os.fstat(f.fileno()).st_size
+    if size == 0: # empty files can not be mapped
+        f.close()
+        return memoryview(b"")
+
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    f.close()
+
+    return memoryview(mm)
+
+def isASCII(text, start: int, end: int):
+    """
+    Whether bytes start to end of the text are all ASCII. The bytes are searched in place,
+    nothing is copied out of a mapped file.
+    """
+    return NON_ASCII.search(text, start, end) is None
+
+def leadByte(text, i: int):
+    """
+    The first byte at or after i that starts a UTF-8 character, or the end of the text.
+    """
+    n = len(text)
+    while i < n and 0x80 <= text[i] < 0xC0:
+        i += 1
+
+    return i
+
+def charCount(text, start: int, end: int):
+    """
+    Number of UTF-8 characters in bytes start to end of the text, the bytes that are not
+    continuation bytes. ASCII runs are measured in place and only blocks with wider
+    characters are copied, SCAN_BLOCK bytes at a time.
+    """
+    first = NON_ASCII.search(text, start, end)
+    if first is None:
+        return end - start
+
+    count = first.start() - start
+    for a in range(first.start(), end, SCAN_BLOCK):
+        b = min(a + SCAN_BLOCK, end)
+        if isASCII(text, a, b):
+            count += b - a
+        else:
+            count += len(bytes(text[a:b]).translate(None, CONTINUATION))
+
+    return count
+
+def charPositions(text, positions):
+    """
+    Turns increasing 1 based byte positions in UTF-8 text into 1 based character positions.
+    The characters between one position and the next are counted as the positions arrive,
+    so the text is read once in total however many positions there are. Up to the next
+    non ASCII byte every byte is a character and no counting is needed. A match of the
+    UTF-8 encoded pattern always starts on a character, as UTF-8 is self synchronising.
+    """
+    byte = 0    # bytes counted so far
+    chars = 0   # characters in them
+    wide = NON_ASCII.search(text)   # first non ASCII byte after them
+    wide = wide.start() if wide else len(text)
+    for p in positions:
+        if p - 1 > wide:
+            chars += charCount(text, byte, p - 1)
+            byte = p - 1
+            wide = NON_ASCII.search(text, byte)
+            wide = wide.start() if wide else len(text)
+
+        yield chars + p - byte
+
+def textBlocks(text, overlap: int = 0, block_size: int = SCAN_BLOCK):
+    """
+    Splits UTF-8 text into blocks of about block_size bytes cut between characters, yielding
+    (offset, block) with offset the number of characters before the block. An ASCII block is a
+    memoryview slice of the text, nothing is copied, and any other block is decoded into a str,
+    so either way a block has one element per character. Consecutive blocks share overlap
+    characters, the last ones of a block start the next, so every run of overlap + 1 characters
+    lies inside one block. A str is already characters and is yielded whole.
+    """
+    if isinstance(text, str):
+        yield 0, text
+        return
+
+    if not isinstance(text, memoryview):
+        text = memoryview(text)
+
+    n = len(text)
+    start = 0   # first byte of the block, the overlap included
+    a = 0       # first byte not in an earlier block
+    offset = 0
+    while a < n:
+        b = leadByte(text, min(a + block_size, n))
+        block = text[start:b]
+        if not isASCII(text, start, b):
+            block = str(block, ENCODING)
+
+        yield offset, block
+
+        # the next block starts with the last overlap characters of this one
+        keep = min(overlap, len(block))
+        if isinstance(block, str):
+            start = b - len(block[len(block) - keep:].encode(ENCODING))
+        else:
+            start = b - keep
+        offset += len(block) - keep
+        a = b
+
+def shardBounds(n: int, len_pat: int, shards: int):
+    """
+    Splits the n - len_pat + 1 window starts of a text of n bytes into at most shards
+    contiguous byte ranges [a, b). A window of len_pat characters takes at least len_pat
+    bytes, so no window starts after them. shardMatches moves both ends of each range
+    to the start of a character, which keeps the ranges next to each other, and searches
+    on len_pat - 1 characters past its end so the last windows of a shard finish.
+    As every window start belongs to exactly one shard no match is found twice.
+    """
+    windows = n - len_pat + 1
+    if windows <= 0:
+        return []
+
+    shards = max(1, min(shards, windows))
+    size = -(-windows // shards)    # ceiling division
+    return [(a, min(a + size, windows)) for a in range(0, windows, size)]
+
+def matchStart(match):
+    """
+    The start of a match, a position or a tuple of positions starting with it.
+    """
+    return match if isinstance(match, int) else match[0]
+
+def shiftMatch(match, offset: int):
+    """
+    A match, a position or a tuple of positions, with every position moved by offset.
+    """
+    if isinstance(match, int):
+        return match + offset
+    return tuple(v + offset for v in match)
+
+def shardMatches(file: str, pat, a: int, b: int, work):
+    """
+    Worker of parallelShards. Maps the text file, moves a and b to the start of a character
+    and runs work(shard, pat) over a memoryview of the bytes from a to len(pat) - 1 characters
+    past b, without copying them. Returns the number of characters in [a, b) and the
+    matches that start there, in character positions counted from a.
+    The map is closed once work is done.
+    """
+    f = open(file, 'rb')
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    f.close()
+
+    view = memoryview(mm)
+    n = len(view)
+    a = leadByte(view, a)
+    b = leadByte(view, b)
+    end = b
+    for _ in range(len(pat) - 1):
+        end = leadByte(view, min(end + 1, n))
+
+    count = charCount(view, a, b)
+    shard = view[a:end]
+    matches = [match for match in work(shard, pat) if matchStart(match) <= count]
+
+    shard.release()
+    view.release()
+    mm.close()
+
+    return count, matches
+
+def parallelShards(file: str, pat, work, serial, workers: int = None, shards_per_worker: int = 4):
+    """
+    Runs a search over shards of the text file in a process pool and merges the matches
+    of each shard in order. work(shard, pat) gives the matches in a shard, 1 based character
+    positions or tuples of them from its start (see shardMatches). Each worker also returns
+    the number of characters in its shard, and a prefix sum of those counts turns the
+    matches into positions in the whole text. Only the file name and bounds are sent to
+    the workers, the text is read through the shared page cache. When the text makes a
+    single shard, serial(text, pat) is run over read_mmap instead, without a pool.
+
+    Time Complexity: O((n + s * m) / p), with s shards and p workers.
+    """
+    n = os.path.getsize(file)
+    workers = workers or os.cpu_count()
+    bounds = shardBounds(n, len(pat), workers * shards_per_worker)
+
+    matches = []
+    if not bounds or not pat:
+        return matches
+
+    if len(bounds) == 1:
+        return serial(read_mmap(file), pat)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(shardMatches, file, pat, a, b, work) for a, b in bounds]
+        results = [future.result() for future in futures]
+
+    offset = 0  # characters in the shards before
+    for count, shard in results:   # shards are in text order so their matches stay in order
+        matches.extend(shiftMatch(match, offset) for match in shard)
+        offset += count
+
+    return matches
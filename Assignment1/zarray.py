@@ -0,0 +1,175 @@
+from array import array
+
+def encode(string):
+    """
+    Turns a string into a buffer that can be indexed without creating new
+    one character strings. bytes, bytearray, memoryview and array inputs are used as is,
+    a str is encoded as latin-1 bytes or, if it has wider characters, an array of code points.
+    Both keep one element per character so indexes into the buffer and the string agree.
+    """
+    if not isinstance(string, str):
+        return string
+
+    try:
+        return string.encode('latin-1')
+    except UnicodeEncodeError:
+        return array('I', map(ord, string))
+
+def join(*parts):
+    """
+    Concatenates several strings or buffers into one encoded buffer. The result is bytes
+    when every part fits in a byte, otherwise an array of code points.
+    """
+    bufs = [encode(part) for part in parts]
+    if all(isinstance(buf, (bytes, bytearray, memoryview)) for buf in bufs):
+        return b"".join(bufs)
+
+    joined = array('I')
+    for buf in bufs:
+        joined.extend(buf)
+    return joined
+
+def zBuffer(n: int):
+    """
+    Allocates a zeroed int32 array for n z values.
+    """
+    return array('i', [0]) * n
+
+def Zalg(string, out=None):
+    """
+    Implementation of the z algorithm over an encoded buffer (see encode).
+    The z values are written into out, an array('i') or NumPy int32 array of at least
+    len(string) values, which is allocated when not given so repeated calls can share one buffer.
+    out[0] is left as 0 and the buffer is returned.
+
+    Time Complexity: O(n), where n is the length of the buffer.
+    Space Complexity: O(n), 4 bytes per character for the z values.
+    """
+    n = len(string)
+    if out is None:
+        out = zBuffer(n)
+    elif len(out) < n:
+        raise ValueError("output buffer holds {0} values, {1} needed".format(len(out), n))
+
+    if n:
+        out[0] = 0
+
+    # initialise left and right (z box)
+    l = 0
+    r = 0
+
+    # iterate through the string
+    for i in range(1, n):
+        if i > r: # case 1, nothing has been matched yet
+            # expanding the z box by increasing r for each matched character
+            l = i
+            r = i
+            while r < n and string[r] == string[r - l]:
+                r += 1
+
+            out[i] = r - l  # set the z val as the size of the z box
+            r -= 1
+
+        else: # inside the z box
+            zk = out[i - l]   # corresponding z value
+
+            if zk < r - i + 1: # case 2a, not reached end of z box, copy already computed z values across.
+                out[i] = zk
+
+            else: # case 2b, the matches of this z box reach the end of it, check the next chars from r
+                l = i
+                r += 1
+                while r < n and string[r] == string[r - l]:
+                    r += 1
+
+                out[i] = r - l  # record the length of z box
+                r -= 1
+
+    return out
+
+def prefixMatches(pat, string, out=None):
+    """
+    For every index s of the string, the length of the longest common prefix of the
+    pattern and string[s:], the same values the z algorithm gives after the "$" of pat + "$" + string
+    but without building the joined copy. The z values of the pattern are reused
+    inside the z box exactly as in Zalg. pat and string must index to the same type.
+
+    Time Complexity: O(m + n)
+    Space Complexity: O(m) apart from out, which holds len(string) values.
+    """
+    n = len(string)
+    m = len(pat)
+    if out is None:
+        out = zBuffer(n)
+    elif len(out) < n:
+        raise ValueError("output buffer holds {0} values, {1} needed".format(len(out), n))
+
+    zPat = Zalg(pat)
+
+    # z box string[l..r] matches pat[0..r-l]
+    l = 0
+    r = -1
+
+    for s in range(n):
+        if s > r: # outside the z box, compare from the start of the pattern
+            k = 0
+        else:
+            zk = zPat[s - l]
+            if zk < r - s + 1: # the match ends inside the z box
+                out[s] = zk
+                continue
+            k = r - s + 1   # the match reaches the end of the z box, compare after it
+
+        while k < m and s + k < n and string[s + k] == pat[k]:
+            k += 1
+
+        out[s] = k
+        if k > 0:
+            l = s
+            r = s + k - 1
+
+    return out
+
+def suffixMatches(pat, string, out=None):
+    """
+    For every index e of the string, the length of the longest common suffix of the
+    pattern and string[:e + 1]. This is prefixMatches over the reversed pattern and string,
+    but the string is read right to left through its indexes instead of being reversed,
+    so only the pattern is copied.
+
+    Time Complexity: O(m + n)
+    Space Complexity: O(m) apart from out, which holds len(string) values.
+    """
+    n = len(string)
+    m = len(pat)
+    if out is None:
+        out = zBuffer(n)
+    elif len(out) < n:
+        raise ValueError("output buffer holds {0} values, {1} needed".format(len(out), n))
+
+    revPat = pat[::-1]
+    zPat = Zalg(revPat)
+
+    # x indexes the reversed string, which is string[n - 1 - x]
+    l = 0
+    r = -1
+
+    for x in range(n):
+        if x > r:
+            k = 0
+        else:
+            zk = zPat[x - l]
+            if zk < r - x + 1:
+                out[n - 1 - x] = zk
+                continue
+            k = r - x + 1
+
+        while k < m and x + k < n and string[n - 1 - x - k] == revPat[k]:
+            k += 1
+
+        out[n - 1 - x] = k
+        if k > 0:
+            l = x
+            r = x + k - 1
+
+    return out
@@ -0,0 +1,184 @@
+"""
+Repeat analysis on suffix trees built by st2sa: longest repeated substring, longest
+common substring of several documents, number of distinct substrings and the most
+frequent substrings. Each query is one traversal of the tree, the text is only read
+to cut out the answer.
+
+The tree's string has to end with a unique terminator (the CLI adds '$'), or be a
+GeneralizedSuffixTree, so that every suffix ends at a leaf.
+
+usage: python analytics.py textFile [min_length] [k]
+       python analytics.py textFile textFile ...       longest common substring
+"""
+import sys
+import heapq
+from st2sa import UkkonenSuffixTree, GeneralizedSuffixTree, read_file
+
+def postOrder(root: object):
+    """
+    Iterative depth first traversal below root, yielding (node, parent depth, depth, children)
+    with every node after its children. Depths are string depths, the length of the path
+    label from the root, and children is the list of the node's children.
+    """
+    stack = [(root, 0, 0, None)]
+    while stack:
+        node, parentDepth, depth, children = stack.pop()
+        if children is not None:    # second visit, the children are done
+            yield node, parentDepth, depth, children
+            continue
+
+        children = list(node.children.values())
+        stack.append((node, parentDepth, depth, children))
+        for child in children:
+            stack.append((child, depth, depth + child.end - child.start + 1, None))
+
+def pathLabel(tree: object, node: object, depth: int):
+    """
+    The path label of an internal node, the depth characters ending at the end of its edge.
+    """
+    return tree.string[node.end - depth + 1 : node.end + 1]
+
+def terminatorPosition(tree: object, leaf: int):
+    """
+    Index in the string of the terminator that ends the suffix of a leaf.
+    """
+    if isinstance(tree, GeneralizedSuffixTree):
+        doc_id, _ = tree.leafLabel(leaf)
+        if doc_id + 1 < len(tree.docStarts):
+            return tree.docStarts[doc_id + 1] - 1
+    return len(tree.string) - 1
+
+def longestRepeatedSubstring(tree: object):
+    """
+    Longest substring occuring at least twice, the path label of the deepest internal node.
+    Returns '' when no character repeats.
+
+    Time Complexity: O(n)
+    """
+    best = None
+    best_depth = 0
+    for node, _, depth, children in postOrder(tree.root):
+        if children and depth > best_depth:
+            best = node
+            best_depth = depth
+
+    return pathLabel(tree, best, best_depth) if best is not None else ''
+
+def distinctSubstrings(tree: object):
+    """
+    Number of distinct non empty substrings of the text (of each document for a
+    GeneralizedSuffixTree), not counting those that contain a terminator.
+    Every distinct substring ends at exactly one position on one edge, so this is the
+    total edge length, where a leaf edge is only counted up to its terminator.
+
+    Time Complexity: O(n)
+    """
+    total = 0
+    for node, parentDepth, depth, children in postOrder(tree.root):
+        if node.start is None:  # root
+            continue
+
+        end = node.end
+        if not children:
+            end = min(end, terminatorPosition(tree, node.leaf) - 1)
+        total += max(0, end - node.start + 1)
+
+    return total
+
+def topFrequentSubstrings(tree: object, k: int, min_length: int = 1):
+    """
+    The k substrings of at least min_length characters that occur most often, as
+    (substring, count) pairs, most frequent, then longest, then first occuring first.
+    The substrings along one edge all occur at the leaves below it, so each internal node
+    is reported once, by its path label, the longest substring with those occurances.
+    Ties are broken by the first occurance, the smallest leaf below the node, so the
+    result does not depend on how the tree was built or where its nodes are in memory.
+
+    Time Complexity: O(n * log(k))
+    """
+    if k <= 0:
+        return []
+
+    below = {}  # (count, first occurance) of the leaves below each finished node
+    heap = []   # the best k (count, depth, -first occurance, node id) so far
+    nodes = {}
+    for node, _, depth, children in postOrder(tree.root):
+        if children:
+            count = 0
+            first = None
+            for child in children:
+                c, f = below.pop(id(child))
+                count += c
+                first = f if first is None else min(first, f)
+        else:
+            count, first = 1, node.leaf
+        below[id(node)] = (count, first)
+
+        if children and node.start is not None and depth >= min_length:
+            item = (count, depth, -first, id(node))   # the node id is only used to find the node
+            nodes[id(node)] = node
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                del nodes[heapq.heapreplace(heap, item)[3]]
+            else:
+                del nodes[id(node)]
+
+    return [(pathLabel(tree, nodes[key], depth), count) for count, depth, _, key in sorted(heap, reverse=True)]
+
+def longestCommonSubstring(documents: list):
+    """
+    Longest substring common to all of the documents, from the deepest node of their
+    GeneralizedSuffixTree that has a leaf of every document below it. The documents
+    below each node are kept as a bit set. A single document is its own longest common
+    substring, and there is none of no documents, which raises a ValueError.
+
+    Time Complexity: O(n * documents / word size)
+    """
+    if not documents:
+        raise ValueError("no documents to find a common substring of")
+    if len(documents) == 1:  # the tree only has internal nodes for repeats
+        return documents[0]
+
+    tree = GeneralizedSuffixTree(documents)
+    every = (1 << len(documents)) - 1
+
+    masks = {}
+    best = None
+    best_depth = 0
+    for node, _, depth, children in postOrder(tree.root):
+        if children:
+            mask = 0
+            for child in children:
+                mask |= masks.pop(id(child))
+            if mask == every and depth > best_depth:
+                best = node
+                best_depth = depth
+        else:
+            mask = 1 << tree.leafLabel(node.leaf)[0]
+        masks[id(node)] = mask
+
+    return pathLabel(tree, best, best_depth) if best is not None else ''
+
+if __name__ == "__main__":
+    # with several files the longest common substring of their first lines is written,
+    # otherwise the longest repeat, the distinct substring count and the top k substrings
+    output_file = open('output_analytics.txt', 'w')
+
+    if len(sys.argv) > 2 and not sys.argv[2].isdigit():
+        documents = [read_file(file)[0].rstrip('\n') for file in sys.argv[1:]]
+        output_file.write('{0}\n'.format(longestCommonSubstring(documents)))
+
+    else:
+        min_length = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+        k = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+        string = read_file(sys.argv[1])[0].rstrip('\n') + '$'
+        tree = UkkonenSuffixTree(string)
+
+        output_file.write('{0}\n'.format(longestRepeatedSubstring(tree)))
+        output_file.write('{0}\n'.format(distinctSubstrings(tree)))
+        for substring, count in topFrequentSubstrings(tree, k, min_length):
+            output_file.write('{0} {1}\n'.format(count, substring))
+
+    output_file.close()
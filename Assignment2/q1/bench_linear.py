@@ -0,0 +1,43 @@
+"""
+Benchmark of the work done by UkkonenSuffixTree as the input grows. Builds instrumented
+trees of random, periodic and unary strings and reports the time and every counter per
+character. Construction is linear when the per character numbers stay flat as n grows.
+
+usage: python bench_linear.py [largest n]       n up to 10000000, about 500 bytes a character
+"""
+import sys
+import time
+import random
+from st2sa import UkkonenSuffixTree, COUNTERS
+
+def makeString(kind: str, n: int):
+    """
+    n characters of the kind followed by a unique terminator.
+    """
+    if kind == "random":
+        return ''.join(random.choice('acgt') for _ in range(n)) + '$'
+    if kind == "periodic":
+        return ('abaab' * (n // 5 + 1))[:n] + '$'
+    return 'a' * n + '$'    # unary, the remainder grows to the whole string
+
+if __name__ == "__main__":
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    random.seed(0)
+    print("{0:<9} {1:>9} {2:>9} {3}".format("kind", "n", "us/char", " ".join("{0:>12}".format(c) for c in COUNTERS + ("total",))))
+
+    n = 1000
+    while n <= largest:
+        for kind in ("random", "periodic", "unary"):
+            string = makeString(kind, n)
+
+            start = time.perf_counter()
+            tree = UkkonenSuffixTree(string, instrument=True)
+            elapsed = time.perf_counter() - start
+
+            counts = [tree.counters[c] / len(string) for c in COUNTERS]
+            print("{0:<9} {1:>9} {2:>9.2f} {3}".format(kind, n, elapsed / len(string) * 1e6,
+                " ".join("{0:>12.3f}".format(c) for c in counts + [sum(counts)])))
+            del tree
+
+        n *= 10
@@ -0,0 +1,46 @@
+"""
+Benchmark of the object based UkkonenSuffixTree against the array based ArraySuffixTree,
+and of the SA-IS suffix array against the tree based one.
+Reports the construction time and the memory held by the finished tree or array.
+
+usage: python bench_tree.py [n]
+"""
+import sys
+import time
+import random
+import tracemalloc
+from st2sa import UkkonenSuffixTree, ArraySuffixTree, suffixes, sais
+
+def measure(name: str, build, string: str):
+    """
+    Builds the tree (or array) once under tracemalloc for its memory and once more for the time.
+    """
+    tracemalloc.start()
+    tree = build(string)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+
+    start = time.perf_counter()
+    build(string)
+    elapsed = time.perf_counter() - start
+
+    n = len(string)
+    print("{0:<24} {1:>8.3f} s {2:>10.1f} bytes/char".format(name, elapsed, size / n))
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    random.seed(0)
+    dna = ''.join(random.choice('acgt') for _ in range(n)) + '$'
+    periodic = ('abaab' * (n // 5 + 1))[:n] + '$'
+
+    print("n = {0}".format(n))
+    measure("objects, random", UkkonenSuffixTree, dna)
+    measure("arrays, random", ArraySuffixTree, dna)
+    measure("objects, periodic", UkkonenSuffixTree, periodic)
+    measure("arrays, periodic", ArraySuffixTree, periodic)
+
+    measure("tree suffix array", lambda s: suffixes(ArraySuffixTree(s).root.children, len(s)), dna)
+    measure("sais, random", sais, dna)
+    measure("sais, periodic", sais, periodic)
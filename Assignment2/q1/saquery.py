@@ -0,0 +1,174 @@
+"""
+Pattern queries over a suffix array, either an index file written by st2sa
+(see st2sa.write_index) or a suffix array built in memory.
+
+usage: python saquery.py indexFile patFile
+"""
+import sys
+from st2sa import load_index, textBytes, read_file
+
+class SuffixArrayQuery:
+    """
+    Count and locate queries by binary search over the suffix array.
+    text is the encoded text (char_width bytes per character, see st2sa.textBytes)
+    and sa the 1 based suffix array. Comparisons are made on the encoded bytes,
+    whose order is the character order.
+    """
+    def __init__(self, text, sa, char_width: int = 1):
+        self.text = text
+        self.sa = sa
+        self.char_width = char_width
+
+    @staticmethod
+    def fromIndex(index):
+        """
+        Queries over a loaded index file (st2sa.load_index).
+        """
+        return SuffixArrayQuery(index.text, index.sa, index.char_width)
+
+    @staticmethod
+    def fromString(string: str, suffixArray):
+        """
+        Queries over a string and its 1 based suffix array.
+        """
+        text, char_width = textBytes(string)
+        return SuffixArrayQuery(text, suffixArray, char_width)
+
+    def encode(self, pat: str):
+        """
+        The pattern encoded as the text is, or None if it has a character the text can not hold.
+        """
+        try:
+            return pat.encode('latin-1' if self.char_width == 1 else 'utf-32-be')
+        except UnicodeEncodeError:
+            return None
+
+    def compare(self, i: int, pat: bytes, k: int):
+        """
+        Compares the suffix at suffix array index i with the pattern, starting from byte k,
+        which the caller knows already match. Returns the number of matching bytes and
+        -1, 0 or 1 as the suffix is smaller, starts with the pattern or is larger.
+        """
+        text = self.text
+        len_text = len(text)
+        len_pat = len(pat)
+        pos = (self.sa[i] - 1) * self.char_width
+
+        while k < len_pat and pos + k < len_text and text[pos + k] == pat[k]:
+            k += 1
+
+        if k == len_pat:
+            return k, 0
+        if pos + k == len_text or text[pos + k] < pat[k]:  # a suffix that runs out is smaller
+            return k, -1
+        return k, 1
+
+    def bound(self, pat: bytes, upper: bool, lo: int = -1, hi: int = None):
+        """
+        Binary search for the first suffix array index whose suffix starts with the pattern
+        (upper False) or is larger than it (upper True), between lo and hi exclusive.
+        Uses the mlr heuristic: every suffix between lo and hi shares at least
+        min(lcp with lo, lcp with hi) bytes with the pattern, so comparisons start there.
+
+        Time Complexity: O(m * log(n)) worst case, usually close to O(m + log(n))
+        Space Complexity: O(1)
+        """
+        if hi is None:
+            hi = len(self.sa)
+        lcp_lo = 0
+        lcp_hi = 0
+
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            k, c = self.compare(mid, pat, min(lcp_lo, lcp_hi))
+            if c < 0 or (upper and c == 0):
+                lo = mid
+                lcp_lo = k
+            else:
+                hi = mid
+                lcp_hi = k
+
+        return hi
+
+    def interval(self, pat: str, lo: int = -1, hi: int = None):
+        """
+        Suffix array indices [start, end) of the suffixes starting with the pattern.
+        lo and hi can narrow the search to indices known to bracket the interval.
+        """
+        pat = self.encode(pat)
+        if not pat:     # an empty pattern, or one that can not occur
+            return 0, 0
+
+        start = self.bound(pat, False, lo, hi)
+        end = self.bound(pat, True, start - 1, hi)
+        return start, end
+
+    def count(self, pat: str):
+        """
+        Number of occurances of the pattern in the text.
+        """
+        start, end = self.interval(pat)
+        return end - start
+
+    def locate(self, pat: str):
+        """
+        1 based positions of the occurances of the pattern, in ascending order.
+        """
+        start, end = self.interval(pat)
+        return sorted(self.sa[start:end])
+
+    def batchIntervals(self, patterns: list):
+        """
+        Suffix array intervals of many patterns, in the order given. The patterns are
+        answered in sorted order, so the interval of a pattern starts no earlier than the
+        previous one and, when the previous pattern is a prefix of it, lies inside the
+        previous interval. Each search is narrowed to that range.
+        """
+        intervals = [None] * len(patterns)
+        order = sorted(range(len(patterns)), key=lambda i: patterns[i])
+
+        prev = None
+        start = 0
+        end = 0
+        for i in order:
+            pat = patterns[i]
+            if pat != prev:
+                if prev and pat.startswith(prev):
+                    start, end = self.interval(pat, start - 1, end)
+                else:
+                    start, end = self.interval(pat, start - 1)
+                prev = pat
+            intervals[i] = (start, end)
+
+        return intervals
+
+    def batchCount(self, patterns: list):
+        """
+        count for each of the patterns, see batchIntervals.
+        """
+        return [end - start for start, end in self.batchIntervals(patterns)]
+
+    def batchLocate(self, patterns: list):
+        """
+        locate for each of the patterns, see batchIntervals.
+        """
+        return [sorted(self.sa[start:end]) for start, end in self.batchIntervals(patterns)]
+
+if __name__ == "__main__":
+    # reading in file names, one pattern per line of patFile
+    _, indexFile, patFile = sys.argv
+
+    index = load_index(indexFile)
+    patterns = [line.rstrip('\n') for line in read_file(patFile)]
+
+    query = SuffixArrayQuery.fromIndex(index)
+    positions = query.batchLocate(patterns)
+
+    # writing output to output_query.txt, the count and then the positions of each pattern
+    output_file = open('output_query.txt', 'w')
+    for i in range(len(patterns)):
+        output_file.write(' '.join(str(p) for p in [len(positions[i])] + positions[i]) + '\n')
+    output_file.close()
+
+    del query, positions
+    index.close()
@@ -2,57 +2,123 @@
 Name: Andreas Kardis
 ID: 31468438
 """
+import os
 import sys
+import mmap
+import struct
+from array import array
+from bisect import bisect_right
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-globalEnd = -1
+# header of the binary index: magic, integer width, character width, suffix array length, text length
+INDEX_MAGIC = b"ST2SAIDX"
+INDEX_HEADER = struct.Struct('<8sIIQQ')
+
+# saved suffix trees use the same header, with the number of nodes in place of the suffix array length
+TREE_MAGIC = b"ST2STREE"
+
+# work counted by an instrumented UkkonenSuffixTree: nodes created, edges skipped by skip count,
+# suffix links followed and applications of each extension rule (rule 1 is one leaf end update a phase)
+COUNTERS = ("nodes", "skip_hops", "suffix_links", "rule1", "rule2", "rule3")
+
+# private use ranges the document terminators of a GeneralizedSuffixTree are taken from
+TERMINATOR_RANGES = ((0xE000, 0xF8FF), (0xF0000, 0xFFFFD), (0x100000, 0x10FFFD))
 
 class Node:
     """
     This class creates a node and also stores the values of the edge that lead into it.
+    Leaves share their tree's leafEnd, a one element list holding the tree's current end,
+    so every leaf is extended at once and trees do not affect each other.
     """
-    def __init__(self, extension: int, start: int, end: int, suffixLink: object = None):
+    def __init__(self, extension: int, start: int, end: int, suffixLink: object = None, leafEnd: list = None):
         self.leaf = extension
         self.suffixLink = suffixLink
         self.start = start
-        self.end = end
+        self.leafEnd = leafEnd
+        self._end = end
         self.children = {}
 
-    def __getattribute__(self, name: str):
+    @property
+    def end(self):
         """
-        Is used to keep each leaf node up to date with the global end value.
+        Keeps each leaf node up to date with the end value of its tree.
         """
-        if name == 'end' and self.leaf != None:
-            return globalEnd
-        
-        return super(Node, self).__getattribute__(name)
-            
+        if self.leafEnd is not None:
+            return self.leafEnd[0]
+
+        return self._end
+
+    @end.setter
+    def end(self, end: int):
+        self._end = end
 
 class UkkonenSuffixTree:
-    def __init__(self, string: str):
+    def __init__(self, string: str = '', instrument: bool = False):
         """
         This method creates the suffix tree using Ukkonen's optimisations when the class is called.
         It uses the Node class along with the newNode method to create new edges and nodes.
+        The tree can be extended afterwards with append.
+        With instrument set, self.counters counts the work done (see COUNTERS).
         """
-        global globalEnd
-        self.string = string
+        self.chars = []     # the text, one character an element so append extends it in place
+        self._string = ''   # the text joined into a str, made again after an append
+        self.leafEnd = [-1] # end of every leaf edge, shared by the leaves
+        self.counters = dict.fromkeys(COUNTERS, 0) if instrument else None
         self.root = self.newNode(None, None, None)
+        self.root.suffixLink = self.root    # root node is suffix linked to itself
 
-        # base case, phase = extension = 0
-        last_j = 0  # explicit extensions
+        # active point, kept between calls to append
+        self.last_j = -1    # last explicit extension
         self.activeNode = self.root
         self.activeLength = 0
-        self.rem = []
-        globalEnd = 0
-        self.root.children[string[0]] = self.newNode(1, 0, globalEnd)
-        self.root.suffixLink = self.root    # root node is suffix linked to itself
 
-        n = len(string)
+        # the remainder, the suffixes still to be added explicitly, is always the contiguous
+        # run string[remStart:remEnd] so it is kept as two indices
+        self.remStart = 0
+        self.remEnd = 0
+
+        self.append(string)
+
+    @property
+    def string(self):
+        """
+        The text of the tree as a str, joined from chars the first time it is used after an append.
+        """
+        if self._string is None:
+            self._string = ''.join(self.chars)
+        return self._string
+
+    @property
+    def rem(self):
+        """
+        Positions in the string of the characters in the remainder.
+        """
+        return range(self.remStart, self.remEnd)
+
+    def append(self, chars: str):
+        """
+        Extends the tree with more characters, continuing the phases from the saved active point,
+        so a tree built from a + b is the same as one built from a and appended with b.
+        Like any Ukkonen tree, suffixes are only all leaves once a unique last character is added.
+
+        Time Complexity: O(len(chars)) amortised, the text is extended in place rather than copied.
+        Space Complexity: O(len(chars))
+        """
+        string = self.chars
+        string.extend(chars)
+        if chars:
+            self._string = None
+        counters = self.counters
+
         # phase
-        for i in range(1, n):
-            globalEnd += 1
+        for i in range(len(string) - len(chars), len(string)):
+            self.leafEnd[0] = i
             prevInternalNode = None
+            if counters is not None:
+                counters["rule1"] += 1   # one update extends every leaf
 
-            j = last_j + 1  # as globalEnd performes all rule 1s
+            j = self.last_j + 1  # as leafEnd performes all rule 1s
             # extension
             while j <= i:
                 # skip-count down, where skipCountNode acts as the activeNode when it has traversed
@@ -62,7 +128,9 @@ class UkkonenSuffixTree:
                 if self.activeLength == 0:
                     # if the node already has a leading edge starting with string[i]
                     if string[i] in skipCountNode.children:
-                        self.rem.append(i)
+                        self.remAppend(i)
+                        if counters is not None:
+                            counters["rule3"] += 1
 
                         if prevInternalNode: # unresolved suffix link
                             prevInternalNode.suffixLink = self.activeNode
@@ -78,7 +146,9 @@ class UkkonenSuffixTree:
                         break
 
                     else:   # rule 2 (case 1)
-                        skipCountNode.children[string[i]] = self.newNode(j+1, i, globalEnd)  # start at the active node and create a new leaf
+                        skipCountNode.children[string[i]] = self.newNode(j+1, i, None)  # start at the active node and create a new leaf
+                        if counters is not None:
+                            counters["rule2"] += 1
 
                         # internal node was not created, so link the internal node previously created to active node
                         if prevInternalNode and prevInternalNode.suffixLink != self.activeNode: # unresolved suffix link
@@ -86,9 +156,11 @@ class UkkonenSuffixTree:
                             prevInternalNode = None
 
                 # traverse down edge and see if there is a match
-                elif self.string[skipCountNode.start + self.activeLength] == self.string[i]:
-                    self.rem.append(i)
+                elif string[skipCountNode.start + self.activeLength] == string[i]:
+                    self.remAppend(i)
                     self.activeLength += 1
+                    if counters is not None:
+                        counters["rule3"] += 1
 
                     if prevInternalNode: # unresolved suffix link
                             prevInternalNode.suffixLink = self.activeNode
@@ -96,34 +168,20 @@ class UkkonenSuffixTree:
                     break
 
                 else: # no match, add an internal node
-                    # Connect newEdge to the the pre-existing skipCountNode
-                    # oldEdge acts as the pre-existing skipCountNode
-                    oldEdge = self.newNode(None, None, None)
-                    
-                    # need to save skipCountNode variables in temporary variables as otherwise these values will be updated with newEdge
-                    leaf = skipCountNode.leaf
-                    oldEdge.leaf = leaf
-                    start = skipCountNode.start
-                    oldEdge.start = self.activeLength + start
-                    end = skipCountNode.end
-                    oldEdge.end = end
-                    suffixLink = skipCountNode.suffixLink
-                    oldEdge.suffixLink = suffixLink
-                    children = skipCountNode.children
-                    oldEdge.children = children
-
-                    # newEdge takes skipCountNode's place and populates it correctly
-                    newEdge = skipCountNode
-                    newEdge.end = skipCountNode.start + self.activeLength - 1
-                    newEdge.suffixLink = None
-                    newEdge.leaf = None
-                    newEdge.children = {}
-                    
-                    # add child to the new edge
-                    newEdge.children[string[i]] = self.newNode(j+1, i, globalEnd)
+                    # newEdge is the new internal node on the path to skipCountNode.
+                    # skipCountNode is kept as the lower part of the edge so that suffix links
+                    # already pointing at it (or at a node created earlier in this phase) stay valid
+                    newEdge = self.newNode(None, skipCountNode.start, skipCountNode.start + self.activeLength - 1)
+                    self.activeNode.children[string[skipCountNode.start]] = newEdge
+
+                    # the old edge now starts after the split
+                    skipCountNode.start += self.activeLength
 
-                    # add the old edge to the new edge
-                    newEdge.children[string[oldEdge.start]] = oldEdge
+                    # add the old edge and a new leaf to the new edge
+                    newEdge.children[string[skipCountNode.start]] = skipCountNode
+                    newEdge.children[string[i]] = self.newNode(j+1, i, None)
+                    if counters is not None:
+                        counters["rule2"] += 1
 
                     # check if the previous extension created an internal node
                     # save this node and link it to the new one if created in the same phase
@@ -135,29 +193,42 @@ class UkkonenSuffixTree:
                         prevInternalNode = newEdge
                 
                 if self.activeNode == self.activeNode.suffixLink or not self.activeNode.suffixLink:    # dont follow a suffix link out
-                    if self.rem:
-                        self.rem = self.rem[1:]
+                    if self.remStart < self.remEnd:
+                        self.remStart += 1
                     if self.activeLength > 0:
                         self.activeLength -= 1
 
                 elif self.activeNode.suffixLink:
                     self.activeNode = self.activeNode.suffixLink  # follow suffix link out of active node
-                    self.rem = self.rem[1:]
+                    if self.remStart < self.remEnd:
+                        self.remStart += 1
+                    if counters is not None:
+                        counters["suffix_links"] += 1
 
-                    if not self.rem and self.activeLength > 0:
+                    if self.remStart == self.remEnd and self.activeLength > 0:
                         self.activeLength -= 1
                     
-                last_j += 1
+                self.last_j += 1
 
                 j += 1
 
     def newNode(self, extension: int, start: int, end: int, suffixLink: object = None):
         """
-        Creates a new node using the Node class.
+        Creates a new node using the Node class, leaves (nodes with an extension) end at the tree's leafEnd.
         """
-        node = Node(extension, start, end, suffixLink)
+        node = Node(extension, start, end, suffixLink, self.leafEnd if extension != None else None)
+        if self.counters is not None:
+            self.counters["nodes"] += 1
 
         return node
+
+    def remAppend(self, i: int):
+        """
+        Adds position i to the end of the remainder, which it always directly follows.
+        """
+        if self.remStart == self.remEnd:
+            self.remStart = i
+        self.remEnd = i + 1
     
     def traverse(self):
         """
@@ -166,12 +237,12 @@ class UkkonenSuffixTree:
         The output is the current node to be considered.
         """
         # already at the node to consider
-        if self.activeLength == 0 or not self.rem:
+        if self.activeLength == 0 or self.remStart == self.remEnd:
             return self.activeNode
         
         else:
-            rem_length = len(self.rem)
-            skipCountNode = self.activeNode.children[self.string[self.rem[rem_length - self.activeLength]]] # current edge and node being traversed
+            remEnd = self.remEnd
+            skipCountNode = self.activeNode.children[self.chars[remEnd - self.activeLength]] # current edge and node being traversed
 
             curr_edge_length = skipCountNode.end - skipCountNode.start + 1   # accumulation of edge lengths being traversed
             
@@ -180,13 +251,17 @@ class UkkonenSuffixTree:
                 if self.activeLength > curr_edge_length:
                     self.activeNode = skipCountNode  # most recent internal node visited
                     self.activeLength -= curr_edge_length
-                    skipCountNode = skipCountNode.children[self.string[self.rem[rem_length - self.activeLength]]]
+                    skipCountNode = skipCountNode.children[self.chars[remEnd - self.activeLength]]
                     curr_edge_length = skipCountNode.end - skipCountNode.start + 1
+                    if self.counters is not None:
+                        self.counters["skip_hops"] += 1
                 
                 # reached edge and node to consider
                 elif self.activeLength == curr_edge_length:
                     self.activeNode = skipCountNode
                     self.activeLength = 0
+                    if self.counters is not None:
+                        self.counters["skip_hops"] += 1
                     break
 
                 else:   # final iteration of skip counting
@@ -194,62 +269,789 @@ class UkkonenSuffixTree:
 
             return skipCountNode
         
-def extract_raw_suffixes(node: object):
-    """
-    This method traverses the suffix tree and recursively and returns the 
-    leading character of the edges and the leaf value. The '' values 
-    represent moving up a node and the None values represent going 
-    up a node and reading its leaf value.
-    The output is a list of these values.
-    """
-    # if key in node: return node[key].start
-    l = []
-    if node:
-        for k, v in node.items():
-            l += [k] + extract_raw_suffixes(v.children) + [v.leaf]
-            l += ['']
-            
-        return l
-    else:
-        return []    # reached a leaf node
-    
-def suffixes(node: object, len_str):
+def terminator(doc_id: int):
+    """
+    The unique terminator of a document, the doc_id-th private use character.
+    """
+    for low, high in TERMINATOR_RANGES:
+        if doc_id <= high - low:
+            return chr(low + doc_id)
+        doc_id -= high - low + 1
+
+    raise ValueError("no terminator left for document {0}".format(doc_id))
+
+def isTerminator(char: str):
+    """
+    Whether the character is in one of the TERMINATOR_RANGES.
+    """
+    code = ord(char)
+    for low, high in TERMINATOR_RANGES:
+        if low <= code <= high:
+            return True
+
+    return False
+
+class GeneralizedSuffixTree(UkkonenSuffixTree):
+    """
+    Suffix tree of several documents, each added with its own unique terminator
+    (see terminator) so every suffix of every document ends at a leaf. Documents can be
+    added at any time, the tree is extended from where it stopped.
+    Leaves keep their position in the concatenated string, leafLabel turns it into
+    the document and the 1 based offset in it.
+    """
+    def __init__(self, documents: list = ()):
+        self.docStarts = []     # 0 based start of each document in string
+        super(GeneralizedSuffixTree, self).__init__()
+
+        for document in documents:
+            self.addDocument(document)
+
+    def addDocument(self, document: str):
+        """
+        Adds the document and its terminator to the tree. Returns the document's id.
+        """
+        for char in set(document):
+            if isTerminator(char):
+                raise ValueError("document contains the private use character {0!r}".format(char))
+
+        doc_id = len(self.docStarts)
+        self.docStarts.append(len(self.chars))
+        self.append(document + terminator(doc_id))
+
+        return doc_id
+
+    def leafLabel(self, leaf: int):
+        """
+        (doc_id, offset) of a leaf value, offset is 1 based within the document.
+        The terminator of a document is at offset len(document) + 1.
+        """
+        doc_id = bisect_right(self.docStarts, leaf - 1) - 1
+        return doc_id, leaf - self.docStarts[doc_id]
+
+    def document(self, doc_id: int):
+        """
+        The text of a document, without its terminator.
+        """
+        end = self.docStarts[doc_id + 1] if doc_id + 1 < len(self.docStarts) else len(self.chars)
+        return ''.join(self.chars[self.docStarts[doc_id] : end - 1])
+
+# end of a leaf edge in ArraySuffixTree, read as the tree's current leaf end
+LEAF_END = -1
+
+class ArrayNode:
+    """
+    View of one node of an ArraySuffixTree (or a StoredSuffixTree) with the same attributes as Node.
+    Views are created on access and only hold the tree and the node id.
     """
-    Suffixes interpretes the list from extract_raw_suffixes to generate a suffix array.
-    Output is a suffix array.
+    __slots__ = ('tree', 'id')
+
+    def __init__(self, tree: object, id: int):
+        self.tree = tree
+        self.id = id
+
+    @property
+    def start(self):
+        start = self.tree.start[self.id]
+        return None if start < 0 else start
+
+    @property
+    def end(self):
+        return self.tree.edgeEnd(self.id)
+
+    @property
+    def leaf(self):
+        leaf = self.tree.leaf[self.id]
+        return None if leaf < 0 else leaf
+
+    @property
+    def suffixLink(self):
+        return ArrayNode(self.tree, self.tree.link[self.id])
+
+    @property
+    def children(self):
+        """
+        Dictionary of the children keyed by the first character of their edge, as in Node.
+        """
+        tree = self.tree
+        children = {}
+        for child in tree.childIds(self.id):
+            children[tree.edgeChar(child)] = ArrayNode(tree, child)
+
+        return children
+
+    def __eq__(self, other):
+        return isinstance(other, ArrayNode) and self.tree is other.tree and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+class ArraySuffixTree:
     """
-    raw_suffix_list = extract_raw_suffixes(node)
-    len_raw_suffix = len(raw_suffix_list)
-    suffix_strings = []
-    curr_suffix = ''
-    i = 0   # suffix_strings index
-    j = 0   # raw_suffix_list index
+    Suffix tree built with Ukkonen's algorithm where the nodes are rows of parallel
+    int32 columns instead of Node objects: edge start, edge end, suffix link and leaf number,
+    with the children of each node kept as a linked list in the first and next columns.
+    Leaf edges store LEAF_END as their end, which is read as self.leafEnd, so leaves
+    are extended by rule 1 without any per node work. The root attribute gives
+    ArrayNode views with the same attributes as Node, so suffixes() works on either tree.
+    """
+    def __init__(self, string: str):
+        self.string = string
+        self.start = array('i')
+        self.end = array('i')
+        self.link = array('i')
+        self.leaf = array('i')
+        self.first = array('i')    # first child
+        self.next = array('i')     # next sibling
+        self.leafEnd = -1
 
-    while i < len_str + 1 and j < len_raw_suffix:
-        if isinstance(raw_suffix_list[j], int):  # see a number
-            suffix_strings.append((curr_suffix, raw_suffix_list[j]))
-            curr_suffix = curr_suffix[:-1]  # remove last character
-            i += 1
-            j += 1
+        ROOT = self.newNode(-1, -1, -1)
 
-        elif raw_suffix_list[j] == None:    # see a None go to next suffix string
-            curr_suffix = curr_suffix[:-1]  # remove last character
-            j += 2  # skip the current none and next empty str
+        activeNode = ROOT
+        activeEdge = 0      # index in the string of the first character of the active edge
+        activeLength = 0
+        remainder = 0       # suffixes still to be added explicitly
+
+        for i in range(len(string)):
+            self.leafEnd = i    # rule 1 for every leaf
+            remainder += 1
+            lastInternal = -1   # internal node waiting for its suffix link
+
+            while remainder > 0:
+                if activeLength == 0:
+                    activeEdge = i
+
+                child = self.child(activeNode, string[activeEdge])
+
+                if child == -1: # rule 2, new leaf from the active node
+                    self.addChild(activeNode, self.newNode(i, LEAF_END, i - remainder + 2))
+                    if lastInternal != -1:
+                        self.link[lastInternal] = activeNode
+                        lastInternal = -1
+
+                else:
+                    # skip count down the edge when the active length covers it
+                    edgeLength = self.edgeEnd(child) - self.start[child] + 1
+                    if activeLength >= edgeLength:
+                        activeEdge += edgeLength
+                        activeLength -= edgeLength
+                        activeNode = child
+                        continue
+
+                    # rule 3, the character is already on the edge
+                    if string[self.start[child] + activeLength] == string[i]:
+                        if lastInternal != -1:
+                            self.link[lastInternal] = activeNode
+                        activeLength += 1
+                        break
+
+                    # rule 2, split the edge with a new internal node and add a leaf to it
+                    split = self.newNode(self.start[child], self.start[child] + activeLength - 1, -1)
+                    self.replaceChild(activeNode, child, split)
+                    self.start[child] += activeLength
+                    self.addChild(split, child)
+                    self.addChild(split, self.newNode(i, LEAF_END, i - remainder + 2))
+
+                    if lastInternal != -1:
+                        self.link[lastInternal] = split
+                    lastInternal = split
+
+                remainder -= 1
+                if activeNode == ROOT and activeLength > 0:
+                    activeLength -= 1
+                    activeEdge = i - remainder + 1
+                elif activeNode != ROOT:
+                    activeNode = self.link[activeNode]
+
+    @property
+    def root(self):
+        return ArrayNode(self, 0)
+
+    def newNode(self, start: int, end: int, leaf: int):
+        """
+        Appends a row for a new node and returns its id, the suffix link defaults to the root.
+        """
+        self.start.append(start)
+        self.end.append(end)
+        self.link.append(0)
+        self.leaf.append(leaf)
+        self.first.append(-1)
+        self.next.append(-1)
 
-        elif raw_suffix_list[j] == '': # onto next suffix
-            j += 1
+        return len(self.start) - 1
 
+    def edgeEnd(self, node: int):
+        """
+        Index of the last character on the edge into node, or None for the root.
+        """
+        end = self.end[node]
+        if node == 0:
+            return None
+        if end == LEAF_END:
+            return self.leafEnd
+        return end
+
+    def child(self, node: int, c):
+        """
+        Child of node whose edge starts with c, or -1.
+
+        Time Complexity: O(sigma)
+        """
+        child = self.first[node]
+        while child != -1 and self.string[self.start[child]] != c:
+            child = self.next[child]
+
+        return child
+
+    def edgeChar(self, node: int):
+        """
+        First character of the edge into node.
+        """
+        return self.string[self.start[node]]
+
+    def childIds(self, node: int):
+        """
+        Ids of the children of node.
+        """
+        child = self.first[node]
+        while child != -1:
+            yield child
+            child = self.next[child]
+
+    def addChild(self, node: int, child: int):
+        self.next[child] = self.first[node]
+        self.first[node] = child
+
+    def replaceChild(self, node: int, old: int, new: int):
+        """
+        Puts new in the place of old in the children of node.
+        """
+        self.next[new] = self.next[old]
+        if self.first[node] == old:
+            self.first[node] = new
         else:
-            curr_suffix += raw_suffix_list[j]
-            j += 1
-            
-    suffix_strings = sorted(suffix_strings)
-    suffixArray = []
-    for i in range(len(suffix_strings)):
-        suffixArray.append(suffix_strings[i][1])
+            child = self.first[node]
+            while self.next[child] != old:
+                child = self.next[child]
+            self.next[child] = new
+        self.next[old] = -1
+
+def lexicographicLeaves(node: dict):
+    """
+    Depth first traversal of the suffix tree below the children dictionary node, visiting
+    the children of every node in the order of the first character of their edge. Edges out
+    of a node start with different characters, so the leaves come out in the lexicographic
+    order of their suffixes. An explicit stack is used, so deep trees do not hit the recursion limit.
+    Yields the leaf value (1 based suffix position) of each leaf.
+
+    Time Complexity: O(n * log(alphabet))
+    Space Complexity: O(n)
+    """
+    # children are pushed largest first so the smallest is popped first
+    stack = [node[k] for k in sorted(node, reverse=True)]
+    while stack:
+        v = stack.pop()
+        children = v.children
+        if children:
+            for k in sorted(children, reverse=True):
+                stack.append(children[k])
+        else:   # reached a leaf node
+            yield v.leaf
+
+def suffixes(node: dict, len_str: int):
+    """
+    Suffixes reads the leaves of the suffix tree in lexicographic order (see lexicographicLeaves),
+    which is the suffix array, so no suffix strings are built and nothing is sorted.
+    Output is the suffix array as an array('i') of at most len_str positions.
+    """
+    suffixArray = array('i', [0]) * len_str
+    i = 0
+    for leaf in lexicographicLeaves(node):
+        suffixArray[i] = leaf
+        i += 1
+
+    # a string without a unique last character has fewer leaves than suffixes
+    del suffixArray[i:]
 
     return suffixArray
-    
+
+def sais(string: str):
+    """
+    Builds the suffix array directly with SA-IS (induced sorting), without a suffix tree.
+    The characters are encoded as their rank in the alphabet and a virtual sentinel
+    smaller than every character is added, so suffixes are ordered exactly as
+    suffixes(UkkonenSuffixTree(string).root.children, len(string)) orders them.
+    The output is an array('i') of the 1 based suffix positions.
+
+    Time Complexity: O(n)
+    Space Complexity: O(n)
+    """
+    alphabet = sorted(set(string))
+    rank = {}
+    for i in range(len(alphabet)):
+        rank[alphabet[i]] = i + 1
+
+    text = array('i', [rank[c] for c in string])
+    text.append(0)  # sentinel
+
+    suffixArray = sais_int(text, len(alphabet) + 1)
+
+    # drop the sentinel, which is always first, and make the positions 1 based
+    result = array('i', [0]) * len(string)
+    for i in range(len(string)):
+        result[i] = suffixArray[i + 1] + 1
+
+    return result
+
+def sais_int(text: array, alphabet_size: int):
+    """
+    SA-IS over integers in [0, alphabet_size), where text ends with a unique 0.
+    Sorts the LMS substrings by induced sorting, names them, recursively sorts the
+    reduced string when names repeat and then induces the full suffix array from the sorted LMS suffixes.
+    Returns the 0 based suffix array, including the sentinel.
+    """
+    n = len(text)
+
+    # suffix types, 1 for S (smaller than the next suffix) and 0 for L
+    types = bytearray(n)
+    types[n - 1] = 1
+    for i in range(n - 2, -1, -1):
+        if text[i] < text[i + 1] or (text[i] == text[i + 1] and types[i + 1]):
+            types[i] = 1
+
+    def isLMS(i: int):
+        return i > 0 and types[i] and not types[i - 1]
+
+    counts = [0] * alphabet_size
+    for c in text:
+        counts[c] += 1
+
+    def bucketHeads():
+        heads = [0] * alphabet_size
+        total = 0
+        for c in range(alphabet_size):
+            heads[c] = total
+            total += counts[c]
+        return heads
+
+    def bucketTails():
+        tails = [0] * alphabet_size
+        total = 0
+        for c in range(alphabet_size):
+            total += counts[c]
+            tails[c] = total
+        return tails
+
+    def induce(suffixArray: array):
+        # L type suffixes from the bucket heads, left to right
+        heads = bucketHeads()
+        for i in range(n):
+            j = suffixArray[i] - 1
+            if j >= 0 and not types[j]:
+                suffixArray[heads[text[j]]] = j
+                heads[text[j]] += 1
+
+        # S type suffixes from the bucket tails, right to left
+        tails = bucketTails()
+        for i in range(n - 1, -1, -1):
+            j = suffixArray[i] - 1
+            if j >= 0 and types[j]:
+                tails[text[j]] -= 1
+                suffixArray[tails[text[j]]] = j
+
+    def lmsEqual(a: int, b: int):
+        # the sentinel's LMS substring is unique
+        if a == n - 1 or b == n - 1:
+            return False
+        k = 0
+        while True:
+            if k > 0 and isLMS(a + k) and isLMS(b + k):
+                return True
+            if text[a + k] != text[b + k] or types[a + k] != types[b + k] or isLMS(a + k) != isLMS(b + k):
+                return False
+            k += 1
+
+    # 1. sort the LMS substrings by placing the LMS suffixes at their bucket tails and inducing
+    suffixArray = array('i', [-1]) * n
+    tails = bucketTails()
+    lmsPositions = array('i')
+    for i in range(1, n):
+        if isLMS(i):
+            lmsPositions.append(i)
+            tails[text[i]] -= 1
+            suffixArray[tails[text[i]]] = i
+    induce(suffixArray)
+
+    # 2. name the LMS substrings in sorted order, equal substrings share a name
+    names = array('i', [-1]) * n
+    name = -1
+    prev = -1
+    for i in range(n):
+        p = suffixArray[i]
+        if isLMS(p):
+            if prev == -1 or not lmsEqual(prev, p):
+                name += 1
+            names[p] = name
+            prev = p
+
+    reduced = array('i', [names[p] for p in lmsPositions])
+
+    # 3. sort the LMS suffixes, directly when every name is unique and recursively otherwise
+    if name + 1 == len(reduced):
+        reducedSA = array('i', [0]) * len(reduced)
+        for i in range(len(reduced)):
+            reducedSA[reduced[i]] = i
+    else:
+        reducedSA = sais_int(reduced, name + 1)
+
+    # 4. place the sorted LMS suffixes at their bucket tails and induce the rest
+    suffixArray = array('i', [-1]) * n
+    tails = bucketTails()
+    for i in range(len(reducedSA) - 1, -1, -1):
+        p = lmsPositions[reducedSA[i]]
+        tails[text[p]] -= 1
+        suffixArray[tails[text[p]]] = p
+    induce(suffixArray)
+
+    return suffixArray
+
+def suffixArrayOf(string: str, method: str = "sais"):
+    """
+    Suffix array of the string with one of the constructions of the CLI,
+    "sais", "array" (ArraySuffixTree) or "tree" (UkkonenSuffixTree).
+    """
+    if method == "sais":
+        return sais(string)
+    if method == "array":
+        return suffixes(ArraySuffixTree(string).root.children, len(string))
+    return suffixes(UkkonenSuffixTree(string).root.children, len(string))
+
+def batchSuffixArrays(strings: list, method: str = "sais", workers: int = None, processes: bool = True):
+    """
+    Suffix arrays of many strings, in the order given, built in a process pool
+    or a thread pool when processes is False. Strings are handed to the workers
+    in chunks so many small documents do not pay for one round trip each.
+    """
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(strings) // (workers * 4))
+
+    Executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with Executor(max_workers=workers) as executor:
+        return list(executor.map(suffixArrayOf, strings, repeat(method), chunksize=chunksize))
+
+def batchTrees(strings: list, tree: type = UkkonenSuffixTree, workers: int = None):
+    """
+    Suffix trees of many strings, in the order given, built in a thread pool.
+    Each tree keeps its own state so they stay valid side by side. Trees are returned
+    from threads rather than processes as sending a tree of objects between processes costs more than building it.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(tree, strings))
+
+def kasai(string: str, suffixArray):
+    """
+    Kasai's algorithm for the LCP array of a 1 based suffix array. lcp[i] is the length of the
+    longest common prefix of the suffixes at suffixArray[i - 1] and suffixArray[i], and lcp[0] is 0.
+    Suffixes are visited in text order, where the LCP drops by at most one between neighbours.
+
+    Time Complexity: O(n)
+    Space Complexity: O(n)
+    """
+    n = len(string)
+    len_sa = len(suffixArray)
+    typecode = 'i' if n < 1 << 31 else 'q'
+
+    rank = array(typecode, [-1]) * n
+    for i in range(len_sa):
+        rank[suffixArray[i] - 1] = i
+
+    lcp = array(typecode, [0]) * len_sa
+    h = 0
+    for p in range(n):
+        r = rank[p]
+        if r <= 0:  # the smallest suffix (or one missing from the array) has no left neighbour
+            h = 0
+            continue
+
+        q = suffixArray[r - 1] - 1
+        while p + h < n and q + h < n and string[p + h] == string[q + h]:
+            h += 1
+        lcp[r] = h
+        if h > 0:
+            h -= 1
+
+    return lcp
+
+def textBytes(string: str):
+    """
+    The text as bytes with a fixed width per character, latin-1 when every character fits
+    in a byte and UTF-32-BE otherwise. Both keep the byte order the same as the character order.
+    Returns the bytes and the character width.
+    """
+    try:
+        return string.encode('latin-1'), 1
+    except UnicodeEncodeError:
+        return string.encode('utf-32-be'), 4
+
+def padding(offset: int):
+    """
+    Bytes needed to align offset to 8.
+    """
+    return -offset % 8
+
+def write_index(file: str, string: str, suffixArray, lcp):
+    """
+    Writes the text, the 1 based suffix array and the LCP array to a binary index file:
+    a 32 byte header (INDEX_HEADER), the text as textBytes gives it and then the suffix
+    array and LCP columns as little endian int32, or int64 for texts of 2^31 characters or more.
+    Each section starts at a multiple of 8 bytes.
+    """
+    text, char_width = textBytes(string)
+    int_width = 4 if len(string) < 1 << 31 else 8
+    typecode = 'i' if int_width == 4 else 'q'
+
+    f = open(file, 'wb')
+    f.write(INDEX_HEADER.pack(INDEX_MAGIC, int_width, char_width, len(suffixArray), len(string)))
+    f.write(text)
+    f.write(bytes(padding(len(text))))
+
+    for column in (suffixArray, lcp):
+        column = array(typecode, column)
+        if sys.byteorder == 'big':
+            column.byteswap()
+        column.tofile(f)
+    f.close()
+
+class SuffixArrayIndex:
+    """
+    An index file written by write_index, memory mapped so loading does not depend on its size.
+    text is a memoryview of the encoded text (char_width bytes per character),
+    sa and lcp are integer memoryviews over the file.
+    """
+    def __init__(self, file: str):
+        self.file = open(file, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        magic, int_width, char_width, len_sa, len_text = INDEX_HEADER.unpack_from(self.view)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError("{0} is not a suffix array index".format(file))
+
+        self.int_width = int_width
+        self.char_width = char_width
+        self.length = len_text
+
+        offset = INDEX_HEADER.size
+        self.text = self.view[offset : offset + len_text * char_width]
+        offset += len_text * char_width
+        offset += padding(offset)
+
+        typecode = 'i' if int_width == 4 else 'q'
+        columns = []
+        for _ in range(2):
+            column = self.view[offset : offset + len_sa * int_width]
+            if sys.byteorder == 'big':  # stored little endian, only a big endian machine has to copy
+                column = array(typecode, column.tobytes())
+                column.byteswap()
+                column = memoryview(column)
+            else:
+                column = column.cast(typecode)
+            columns.append(column)
+            offset += len_sa * int_width
+        self.sa, self.lcp = columns
+
+    def __len__(self):
+        return len(self.sa)
+
+    def substring(self, start: int, end: int):
+        """
+        Characters start to end (0 based, end exclusive) of the text as a str.
+        """
+        data = bytes(self.text[start * self.char_width : end * self.char_width])
+        return data.decode('latin-1' if self.char_width == 1 else 'utf-32-be')
+
+    def close(self):
+        """
+        Releases the views and unmaps the file.
+        """
+        for name in ('sa', 'lcp', 'text'):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+def load_index(file: str):
+    """
+    Opens an index file written by write_index without reading it.
+    """
+    return SuffixArrayIndex(file)
+
+def save_tree(file: str, tree: object):
+    """
+    Writes a finished suffix tree (UkkonenSuffixTree, ArraySuffixTree or StoredSuffixTree) to a file.
+    Nodes are numbered breadth first with the children of a node in the order of their first
+    character, so the children of every node have consecutive ids. After the header (INDEX_HEADER
+    with TREE_MAGIC) and the text (as in write_index) come little endian integer columns:
+    the node table (suffix link, leaf number or -1, and the id of the first child, with one
+    extra row closing the last node's children) and the edge table (start and end of the edge
+    into each node, -1 for the root).
+
+    Time Complexity: O(n * log(alphabet))
+    Space Complexity: O(n)
+    """
+    root = tree.root
+    nodes = [root]
+    ids = {root: 0}
+    firstChild = [1]
+
+    # breadth first numbering
+    k = 0
+    while k < len(nodes):
+        children = nodes[k].children
+        for c in sorted(children):
+            ids[children[c]] = len(nodes)
+            nodes.append(children[c])
+        firstChild.append(len(nodes))
+        k += 1
+
+    columns = ([], [], firstChild, [], [])  # link, leaf, firstChild, start, end
+    link, leaf, _, start, end = columns
+    for node in nodes:
+        link.append(ids.get(node.suffixLink, 0))
+        leaf.append(-1 if node.leaf is None else node.leaf)
+        start.append(-1 if node.start is None else node.start)
+        end.append(-1 if node.end is None else node.end)
+
+    if isinstance(tree, StoredSuffixTree):  # already encoded, no need to decode it
+        text, char_width = tree.text, tree.char_width
+    else:
+        text, char_width = textBytes(tree.string)
+    len_text = len(text) // char_width
+    int_width = 4 if max(len_text, len(nodes) + 1) < 1 << 31 else 8
+    typecode = 'i' if int_width == 4 else 'q'
+
+    f = open(file, 'wb')
+    f.write(INDEX_HEADER.pack(TREE_MAGIC, int_width, char_width, len(nodes), len_text))
+    f.write(text)
+    f.write(bytes(padding(len(text))))
+
+    for column in columns:
+        column = array(typecode, column)
+        if sys.byteorder == 'big':
+            column.byteswap()
+        column.tofile(f)
+    f.close()
+
+class StoredSuffixTree:
+    """
+    A suffix tree file written by save_tree, memory mapped. Nothing is read when it is opened,
+    the columns are memoryviews over the file and root gives ArrayNode views that are only
+    created as the tree is walked, so it can be used wherever a built tree is.
+    Walking the tree reads single characters from the encoded text (see edgeChar),
+    the whole text is only decoded if string is used.
+    """
+    def __init__(self, file: str):
+        self.file = open(file, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        magic, int_width, char_width, node_count, len_text = INDEX_HEADER.unpack_from(self.view)
+        if magic != TREE_MAGIC:
+            self.close()
+            raise ValueError("{0} is not a saved suffix tree".format(file))
+
+        self.char_width = char_width
+        self._string = None
+
+        offset = INDEX_HEADER.size
+        self.text = self.view[offset : offset + len_text * char_width]
+        offset += len_text * char_width
+        offset += padding(offset)
+
+        typecode = 'i' if int_width == 4 else 'q'
+        columns = []
+        for rows in (node_count, node_count, node_count + 1, node_count, node_count):
+            column = self.view[offset : offset + rows * int_width]
+            if sys.byteorder == 'big':  # stored little endian, only a big endian machine has to copy
+                column = array(typecode, column.tobytes())
+                column.byteswap()
+                column = memoryview(column)
+            else:
+                column = column.cast(typecode)
+            columns.append(column)
+            offset += rows * int_width
+        self.link, self.leaf, self.firstChild, self.start, self.end = columns
+
+    @property
+    def string(self):
+        if self._string is None:
+            self._string = bytes(self.text).decode('latin-1' if self.char_width == 1 else 'utf-32-be')
+        return self._string
+
+    @property
+    def root(self):
+        return ArrayNode(self, 0)
+
+    def __len__(self):
+        return len(self.leaf)
+
+    def edgeEnd(self, node: int):
+        end = self.end[node]
+        return None if end < 0 else end
+
+    def edgeChar(self, node: int):
+        """
+        First character of the edge into node, read from its bytes in the encoded text.
+        """
+        p = self.start[node] * self.char_width
+        if self.char_width == 1:
+            return chr(self.text[p])    # latin-1 bytes are their code points
+        return chr(int.from_bytes(self.text[p : p + 4], 'big'))
+
+    def sameText(self, string: str):
+        """
+        Whether the tree was saved for this string, compared in encoded form.
+        """
+        text, char_width = textBytes(string)
+        return char_width == self.char_width and self.text == text
+
+    def childIds(self, node: int):
+        return range(self.firstChild[node], self.firstChild[node + 1])
+
+    def close(self):
+        """
+        Releases the views and unmaps the file.
+        """
+        for name in ('link', 'leaf', 'firstChild', 'start', 'end', 'text'):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+def load_tree(file: str):
+    """
+    Opens a suffix tree file written by save_tree without reading it.
+    """
+    return StoredSuffixTree(file)
+
+def cachedTree(file: str, string: str):
+    """
+    The suffix tree of the string saved in file by an earlier call, or, when the file is
+    missing or holds another text, a new UkkonenSuffixTree saved there for next time.
+    Returns the tree loaded from the file.
+    """
+    if os.path.exists(file):
+        tree = load_tree(file)
+        if tree.sameText(string):
+            return tree
+        tree.close()
+
+    save_tree(file, UkkonenSuffixTree(string))
+    return load_tree(file)
 
 def read_file(file: str):
     """
@@ -262,12 +1064,24 @@ def read_file(file: str):
     return lines
 
 if __name__ == "__main__":
-    _, textFile = sys.argv
+    # the optional second argument picks the construction, "tree" for the Node tree (the default),
+    # "array" for ArraySuffixTree, "sais" to build the suffix array directly with SA-IS or
+    # "cached" to reuse the tree saved in output_tree.bin by an earlier run on the same text
+    textFile = sys.argv[1]
+    method = sys.argv[2] if len(sys.argv) > 2 else "tree"
 
     textFileContents = read_file(textFile)
     string = textFileContents[0] + '$'
 
-    suffixArray = suffixes(UkkonenSuffixTree(string).root.children, len(string))
+    if method == "sais":
+        suffixArray = sais(string)
+    elif method == "array":
+        suffixArray = suffixes(ArraySuffixTree(string).root.children, len(string))
+    elif method == "cached":
+        tree = cachedTree('output_tree.bin', string)
+        suffixArray = suffixes(tree.root.children, len(string))
+    else:
+        suffixArray = suffixes(UkkonenSuffixTree(string).root.children, len(string))
 
     output_file = open('output_sa.txt', 'w')
     for i in range(len(suffixArray)):
@@ -275,4 +1089,7 @@ if __name__ == "__main__":
         print(suffixArray[i])
     output_file.close()
 
+    # binary index of the text, suffix array and LCP array for tools that mmap it (see load_index)
+    write_index('output_sa.idx', string, suffixArray, kasai(string, suffixArray))
+
 
@@ -3,11 +3,18 @@ Name: Andreas Kardis
 ID: 31468438
 """
 
+import os
 import sys
+
+# st2sa.py is shared with q1 and lives in its directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'q1'))
 import st2sa
 
-def BurrowsWheelerT(string: str):
-    suffixArray = st2sa.suffixes(st2sa.UkkonenSuffixTree(string).root.children, len(string))
+def BurrowsWheelerT(string: str, tree: object = None):
+    # the suffix tree is built unless one is given, such as one loaded by st2sa.cachedTree
+    if tree is None:
+        tree = st2sa.UkkonenSuffixTree(string)
+    suffixArray = st2sa.suffixes(tree.root.children, len(string))
 
     for i in range(len(suffixArray)):
         suffixArray[i] -= 2
@@ -161,12 +168,15 @@ def read_file(file: str):
     return lines
 
 if __name__ == "__main__":
-    _, textFile = sys.argv
+    # an optional "cached" argument reuses the suffix tree saved in bwttree.bin by an earlier run on the same text
+    textFile = sys.argv[1]
+    cached = len(sys.argv) > 2 and sys.argv[2] == "cached"
 
     textFileContents = read_file(textFile)
     string = textFileContents[0] + '$'
     
-    bwt = BurrowsWheelerT(string)
+    tree = st2sa.cachedTree('bwttree.bin', string) if cached else None
+    bwt = BurrowsWheelerT(string, tree)
 
     huffman_code = Huffman_Encoding(string)
 